@@ -24,7 +24,7 @@ result = validator.validate(
 )
 
 print(f"Status: {result.status.value}")
-print(f"Risk Level: {result.risk_score.level.value}")
+print(f"Risk Level: {result.risk_score.level.name}")
 print(f"Risk Score: {result.risk_score.score:.3f}")
 print(f"Risk Factors: {result.risk_score.factors}")
 print(f"Risk Reasoning: {result.risk_score.reasoning}")
@@ -24,7 +24,7 @@ for i in range(15):
     result = validator.validate(user, "CLOSE_APPLICATION", {"app_name": f"app_{i}"})
 
     history_count = len(validator.validation_history.get(user, []))
-    risk_level = result.risk_score.level.value
+    risk_level = result.risk_score.level.name
 
     status_display = f"{result.status.value:20s}"
     if result.status == ValidationStatus.BLOCKED:
@@ -58,5 +58,5 @@ base_risk = scorer._get_base_risk("CLOSE_APPLICATION")
 print(f"CLOSE_APPLICATION base risk: {base_risk}")
 
 risk_score = scorer.calculate_risk("CLOSE_APPLICATION", {"app_name": "test"}, {})
-print(f"Calculated risk level: {risk_score.level.value}")
+print(f"Calculated risk level: {risk_score.level.name}")
 print(f"Calculated risk score: {risk_score.score:.3f}")
@@ -27,7 +27,7 @@ for i in range(12):
     history_count = len(validator.validation_history.get(user, []))
 
     print(
-        f"Request {i + 1:2d}: {result.status.value:20s} | History: {history_count} | Risk: {result.risk_score.level.value}"
+        f"Request {i + 1:2d}: {result.status.value:20s} | History: {history_count} | Risk: {result.risk_score.level.name}"
     )
 
     if result.status == ValidationStatus.BLOCKED:
@@ -41,6 +41,6 @@ risk_score = risk_scorer.calculate_risk(
 )
 
 print(f"\nFull Risk Score:")
-print(f"  Level: {risk_score.level.value}")
+print(f"  Level: {risk_score.level.name}")
 print(f"  Score: {risk_score.score:.3f}")
 print(f"  Factors: {risk_score.factors}")
@@ -33,7 +33,7 @@ result = validator.validate(
     {"to": "boss@company.com", "subject": "Test", "body": "Message"},
 )
 print(f"   Status: {result.status.value}")
-print(f"   Risk Level: {result.risk_score.level.value}")
+print(f"   Risk Level: {result.risk_score.level.name}")
 print(f"   Risk Score: {result.risk_score.score:.3f}")
 is_high = (
     result.risk_score.level in [RiskLevel.HIGH, RiskLevel.MEDIUM]
@@ -46,7 +46,7 @@ try:
     )
     print(f"   ✓ Validation succeeded")
     print(f"      Status: {result.status.value}")
-    print(f"      Risk: {result.risk_score.level.value}")
+    print(f"      Risk: {result.risk_score.level.name}")
 except Exception as e:
     print(f"   ✗ Failed: {e}")
     sys.exit(1)
@@ -46,7 +46,7 @@ def test_safe_weather():
 
     print(f"  M6 Status: {validation.status.value}")
     print(
-        f"  M6 Risk: {validation.risk_score.level.value} ({validation.risk_score.score:.3f})"
+        f"  M6 Risk: {validation.risk_score.level.name} ({validation.risk_score.score:.3f})"
     )
 
     # Assert
@@ -72,7 +72,7 @@ def test_blocked_sql_injection():
 
     print(f"Malicious Query: {malicious_query}")
     print(f"  M6 Status: {validation.status.value}")
-    print(f"  M6 Risk: {validation.risk_score.level.value}")
+    print(f"  M6 Risk: {validation.risk_score.level.name}")
     print(f"  M6 Blocked Reason: {validation.blocked_reason}")
 
     # Assert
@@ -101,7 +101,7 @@ def test_command_injection():
 
     print(f"Malicious Command: {malicious_command}")
     print(f"  M6 Status: {validation.status.value}")
-    print(f"  M6 Risk: {validation.risk_score.level.value}")
+    print(f"  M6 Risk: {validation.risk_score.level.name}")
     print(f"  M6 Blocked Reason: {validation.blocked_reason}")
 
     # Assert
@@ -127,7 +127,7 @@ def test_path_traversal():
 
     print(f"Malicious Path: {malicious_path}")
     print(f"  M6 Status: {validation.status.value}")
-    print(f"  M6 Risk: {validation.risk_score.level.value}")
+    print(f"  M6 Risk: {validation.risk_score.level.name}")
     print(f"  M6 Blocked Reason: {validation.blocked_reason}")
 
     # Assert
@@ -150,7 +150,7 @@ def test_system_shutdown_blocked():
 
     print(f"Tool: SYSTEM_SHUTDOWN")
     print(f"  M6 Status: {validation.status.value}")
-    print(f"  M6 Risk: {validation.risk_score.level.value}")
+    print(f"  M6 Risk: {validation.risk_score.level.name}")
     print(f"  M6 Blocked Reason: {validation.blocked_reason}")
 
     # Assert
@@ -182,7 +182,7 @@ def test_high_risk_email():
 
     print(f"Tool: SEND_EMAIL to boss@company.com")
     print(f"  M6 Status: {validation.status.value}")
-    print(f"  M6 Risk: {validation.risk_score.level.value}")
+    print(f"  M6 Risk: {validation.risk_score.level.name}")
 
     if validation.needs_confirmation():
         print(f"  M6 Confirmation: {validation.confirmation_message}")
@@ -263,7 +263,7 @@ def test_batch_validation():
     print(f"Validating {len(tool_calls)} tools:")
     for i, result in enumerate(results):
         print(
-            f"  Tool {i + 1}: {result.status.value} - Risk: {result.risk_score.level.value}"
+            f"  Tool {i + 1}: {result.status.value} - Risk: {result.risk_score.level.name}"
         )
 
     # Assert
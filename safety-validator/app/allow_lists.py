@@ -1,11 +1,12 @@
 """Allow lists and whitelists for tools and commands."""
 
-import re
 from enum import Enum
-from typing import Set, List, Dict, Any
-import yaml
+from typing import FrozenSet, List, Dict, Any
 from pathlib import Path
 
+from .policy_loader import load_policies
+from .sanitizers import TokenScanner
+
 
 class ToolCategory(str, Enum):
     """Tool categories for allow list management."""
@@ -87,6 +88,9 @@ class ToolCategory(str, Enum):
 class AllowListManager:
     """Manage allow lists and whitelists for security validation."""
 
+    # Executable suffixes ignored when matching application names
+    _APP_SUFFIXES = (".exe", ".app", ".dmg")
+
     def __init__(self, config_path: str = "config/policies.yaml"):
         """Initialize allow list manager.
 
@@ -96,12 +100,40 @@ class AllowListManager:
         self.config_path = Path(config_path)
         self.policies = self._load_policies()
 
-        self.allowed_tools: Set[str] = set(self.policies.get("allowed_tools", []))
-        self.blocked_tools: Set[str] = set(self.policies.get("blocked_tools", []))
-        self.allowed_apps: Set[str] = set(
+        # Immutable after load; frozensets give O(1) membership checks
+        self.allowed_tools: FrozenSet[str] = frozenset(self.policies.get("allowed_tools", []))
+        self.blocked_tools: FrozenSet[str] = frozenset(self.policies.get("blocked_tools", []))
+        self.allowed_apps: FrozenSet[str] = frozenset(
             self.policies.get("parameter_rules", {}).get("applications", {}).get("allowed_apps", [])
         )
 
+        # Case-folded application names, so lookups fold only the query
+        self._allowed_app_keys: FrozenSet[str] = frozenset(
+            app.casefold() for app in self.allowed_apps
+        )
+
+        # File path rules compiled once: length limit, a one-pass scanner
+        # over lowercased blocked patterns, and lowercased extension suffixes
+        path_rules = self.policies.get("parameter_rules", {}).get("file_paths", {})
+        self._path_max_length: int = path_rules.get("max_length", 260)
+        self._path_blocked_patterns = TokenScanner(
+            [(pattern, pattern.lower()) for pattern in path_rules.get("blocked_patterns", [])]
+        )
+        self._path_extensions = tuple(
+            ext.lower() for ext in path_rules.get("allowed_extensions", [])
+        )
+
+        # URL rules compiled once: length limit, scheme prefixes for a single
+        # startswith() call, and a one-pass scanner over blocked domains
+        url_rules = self.policies.get("parameter_rules", {}).get("urls", {})
+        self._url_max_length: int = url_rules.get("max_length", 2000)
+        self._url_scheme_prefixes = tuple(
+            f"{scheme}://" for scheme in url_rules.get("allowed_schemes", ["http", "https"])
+        )
+        self._url_blocked_domains = TokenScanner(
+            [(domain, domain) for domain in url_rules.get("blocked_domains", [])]
+        )
+
     def _load_policies(self) -> Dict[str, Any]:
         """Load policies from YAML file.
 
@@ -109,21 +141,7 @@ class AllowListManager:
             Dictionary of policies
         """
         try:
-            # Try absolute path first
-            if self.config_path.exists():
-                with open(self.config_path, "r") as f:
-                    return yaml.safe_load(f)
-
-            # Try relative to module
-            module_dir = Path(__file__).parent.parent
-            config_file = module_dir / self.config_path
-
-            if config_file.exists():
-                with open(config_file, "r") as f:
-                    return yaml.safe_load(f)
-
-            # Return empty dict if file not found
-            return {}
+            return load_policies(self.config_path)
 
         except Exception as e:
             print(f"Warning: Failed to load policies from {self.config_path}: {e}")
@@ -168,13 +186,14 @@ class AllowListManager:
         Returns:
             True if allowed, False otherwise
         """
-        # Normalize to lowercase for comparison
-        app_lower = app_name.lower().strip()
+        # Normalize case for comparison
+        app_key = app_name.casefold().strip()
 
         # Remove common extensions
-        app_lower = re.sub(r"\.(exe|app|dmg)$", "", app_lower)
+        if app_key.endswith(self._APP_SUFFIXES):
+            app_key = app_key.rsplit(".", 1)[0]
 
-        return app_lower in self.allowed_apps
+        return app_key in self._allowed_app_keys
 
     def get_allowed_tools(self) -> List[str]:
         """Get list of all allowed tools.
@@ -209,26 +228,16 @@ class AllowListManager:
         Returns:
             True if valid, False otherwise
         """
-        url_rules = self.policies.get("parameter_rules", {}).get("urls", {})
-
         # Check length
-        max_length = url_rules.get("max_length", 2000)
-        if len(url) > max_length:
+        if len(url) > self._url_max_length:
             return False
 
         # Check scheme
-        allowed_schemes = url_rules.get("allowed_schemes", ["http", "https"])
-        if not any(url.startswith(f"{scheme}://") for scheme in allowed_schemes):
+        if not url.startswith(self._url_scheme_prefixes):
             return False
 
         # Check blocked domains
-        blocked_domains = url_rules.get("blocked_domains", [])
-        url_lower = url.lower()
-        for domain in blocked_domains:
-            if domain in url_lower:
-                return False
-
-        return True
+        return not self._url_blocked_domains.contains(url.lower())
 
     def validate_file_path(self, path: str) -> bool:
         """Validate file path against allow list.
@@ -239,25 +248,18 @@ class AllowListManager:
         Returns:
             True if valid, False otherwise
         """
-        path_rules = self.policies.get("parameter_rules", {}).get("file_paths", {})
-
         # Check length
-        max_length = path_rules.get("max_length", 260)
-        if len(path) > max_length:
+        if len(path) > self._path_max_length:
             return False
 
         # Check blocked patterns
-        blocked_patterns = path_rules.get("blocked_patterns", [])
         path_lower = path.lower()
-        for pattern in blocked_patterns:
-            if pattern.lower() in path_lower:
-                return False
+        if self._path_blocked_patterns.contains(path_lower):
+            return False
 
         # Check allowed extensions
-        allowed_extensions = path_rules.get("allowed_extensions", [])
-        if allowed_extensions:
-            if not any(path.lower().endswith(ext) for ext in allowed_extensions):
-                return False
+        if self._path_extensions and not path_lower.endswith(self._path_extensions):
+            return False
 
         return True
 
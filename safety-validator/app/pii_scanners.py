@@ -0,0 +1,145 @@
+"""Linear-time scanners for PII patterns that backtrack badly in `re`.
+
+Python's `re` retries a pattern at every start position, so the shipped
+email pattern takes quadratic time on long runs like "a.a.a.a...". The
+scanners here return exactly the matches `re` would, in one pass.
+"""
+
+import re
+import string
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Shipped email PII pattern (config/policies.yaml); only this exact pattern
+# is replaced by the linear scanner
+EMAIL_PATTERN = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
+
+_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + "._%+-")
+_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + ".-")
+_TLD_CHARS = frozenset(string.ascii_letters + "|")
+
+
+def _is_word(char: str) -> bool:
+    """Match `re`'s Unicode definition of a \\w character."""
+    return char.isalnum() or char == "_"
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """Match `re`'s \\b at index."""
+    before = index > 0 and _is_word(text[index - 1])
+    after = index < len(text) and _is_word(text[index])
+    return before != after
+
+
+def _email_domain_end(text: str, start: int) -> int:
+    """End of the `[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}\\b` match at start, or -1.
+
+    Tries the same alternatives as the backtracking engine, in the same
+    order: the last dot first, then the longest TLD ending at a boundary.
+    """
+    length = len(text)
+    run_end = start
+    while run_end < length and text[run_end] in _DOMAIN_CHARS:
+        run_end += 1
+
+    for dot in range(run_end - 1, start, -1):
+        if text[dot] != ".":
+            continue
+
+        tld_end = dot + 1
+        while tld_end < length and text[tld_end] in _TLD_CHARS:
+            tld_end += 1
+
+        for end in range(tld_end, dot + 2, -1):
+            if _is_boundary(text, end):
+                return end
+
+    return -1
+
+
+def find_email_spans(text: str, first_only: bool = False) -> List[Tuple[int, int]]:
+    """Find non-overlapping EMAIL_PATTERN matches, left to right.
+
+    Every start inside a run of local-part characters reaches the same "@",
+    so the domain is checked once per "@" instead of once per start.
+
+    Args:
+        text: Text to scan
+        first_only: Stop after the first match
+
+    Returns:
+        List of (start, end) spans
+    """
+    spans: List[Tuple[int, int]] = []
+    length = len(text)
+    pos = 0
+
+    while pos < length:
+        at = pos
+        while at < length and text[at] in _LOCAL_CHARS:
+            at += 1
+
+        if at > pos and at < length and text[at] == "@":
+            end = _email_domain_end(text, at + 1)
+            if end != -1:
+                start = next((i for i in range(pos, at) if _is_boundary(text, i)), -1)
+                if start != -1:
+                    spans.append((start, end))
+                    if first_only:
+                        break
+                    pos = end
+                    continue
+
+        pos = at + 1
+
+    return spans
+
+
+class LinearPattern:
+    """Stand-in for a compiled pattern, backed by a linear span finder.
+
+    Provides the subset of the `re.Pattern` interface the sanitizer uses.
+    """
+
+    def __init__(self, pattern: str, find_spans: Callable[..., List[Tuple[int, int]]]):
+        """Initialize linear pattern.
+
+        Args:
+            pattern: Regex the finder is equivalent to
+            find_spans: Span finder taking (text, first_only)
+        """
+        self.pattern = pattern
+        self._find_spans = find_spans
+        self._regex = re.compile(pattern)
+
+    def search(self, text: str) -> Optional[Tuple[int, int]]:
+        """Return the first match span, or None."""
+        spans = self._find_spans(text, first_only=True)
+        return spans[0] if spans else None
+
+    def findall(self, text: str) -> List[str]:
+        """Return all matched substrings."""
+        return [text[start:end] for start, end in self._find_spans(text)]
+
+    def sub(self, repl: str, text: str) -> str:
+        """Replace every match with repl.
+
+        Replacements containing backslash escapes go through `re`, which
+        expands them.
+        """
+        if "\\" in repl:
+            return self._regex.sub(repl, text)
+
+        pieces = []
+        last = 0
+        for start, end in self._find_spans(text):
+            pieces.append(text[last:start])
+            pieces.append(repl)
+            last = end
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+
+# Configured pattern string -> linear replacement
+LINEAR_PATTERNS: Dict[str, Callable[[], LinearPattern]] = {
+    EMAIL_PATTERN: lambda: LinearPattern(EMAIL_PATTERN, find_email_spans),
+}
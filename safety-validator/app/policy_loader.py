@@ -0,0 +1,113 @@
+"""Policy file loading shared by the validator components."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is still far faster than YAML
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+# Suffix of the parsed-policy cache written next to the YAML file
+SIDECAR_SUFFIX = ".json"
+
+
+def resolve_config_path(config_path: Path) -> Optional[Path]:
+    """Find the policy file as given or relative to the module root.
+
+    Args:
+        config_path: Configured policy path
+
+    Returns:
+        Existing path, or None if not found
+    """
+    if config_path.exists():
+        return config_path
+
+    config_file = Path(__file__).parent.parent / config_path
+    if config_file.exists():
+        return config_file
+
+    return None
+
+
+def load_policies(config_path: Path) -> Dict[str, Any]:
+    """Load policies from a YAML file.
+
+    A JSON sidecar (``<file>.json``) caches the parsed policies keyed on the
+    YAML file's mtime and size, so later loads skip YAML parsing entirely.
+
+    Args:
+        config_path: Path to policies configuration
+
+    Returns:
+        Dictionary of policies, or {} if the file does not exist
+    """
+    path = resolve_config_path(config_path)
+    if path is None:
+        return {}
+
+    stat = path.stat()
+    version = [stat.st_mtime_ns, stat.st_size]
+    sidecar = path.with_name(path.name + SIDECAR_SUFFIX)
+
+    cached = _read_sidecar(sidecar, version)
+    if cached is not None:
+        return cached
+
+    with open(path, "r") as f:
+        policies = yaml.load(f, Loader=_YamlLoader) or {}
+
+    _write_sidecar(sidecar, version, policies)
+    return policies
+
+
+def _read_sidecar(sidecar: Path, version: list) -> Optional[Dict[str, Any]]:
+    """Read cached policies if the sidecar matches the YAML version."""
+    try:
+        data = sidecar.read_bytes()
+    except OSError:
+        return None
+
+    try:
+        payload = orjson.loads(data) if orjson else json.loads(data)
+    except ValueError:
+        return None
+
+    if not isinstance(payload, dict) or payload.get("version") != version:
+        return None
+
+    return payload.get("policies")
+
+
+def _write_sidecar(sidecar: Path, version: list, policies: Dict[str, Any]) -> None:
+    """Best-effort write of the sidecar; unwritable config dirs are ignored."""
+    payload = {"version": version, "policies": policies}
+
+    try:
+        data = orjson.dumps(payload) if orjson else json.dumps(payload).encode()
+    except (TypeError, ValueError):
+        return
+
+    # Skip policies JSON cannot represent faithfully (e.g. non-string keys)
+    if (orjson.loads(data) if orjson else json.loads(data)) != payload:
+        return
+
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, sidecar)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
@@ -1,34 +1,180 @@
 """Risk scoring algorithm for tool execution."""
 
-from enum import Enum
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
-import yaml
+import re
+from bisect import bisect_right
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from pathlib import Path
 
+from .policy_loader import load_policies
 
-class RiskLevel(str, Enum):
-    """Risk levels for tool execution."""
 
-    LOW = "LOW"  # Safe, no confirmation needed
-    MEDIUM = "MEDIUM"  # Log but allow
-    HIGH = "HIGH"  # Require confirmation
-    CRITICAL = "CRITICAL"  # Block or require explicit authorization
+class RiskLevel(IntEnum):
+    """Risk levels for tool execution, ordered by severity."""
+
+    LOW = 0  # Safe, no confirmation needed
+    MEDIUM = 1  # Log but allow
+    HIGH = 2  # Require confirmation
+    CRITICAL = 3  # Block or require explicit authorization
+
+    # Render by name so log and reasoning strings read "HIGH", not "2"
+    def __str__(self) -> str:
+        return self.name
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.name, format_spec)
 
 
-@dataclass
 class RiskScore:
-    """Risk score with breakdown."""
+    """Risk score with breakdown.
+
+    Instances are immutable so cached scores can be shared between callers.
+    When no reasoning is supplied it is generated on first access, so bulk
+    scoring that never reads it skips the formatting work.
+    """
+
+    __slots__ = ("level", "score", "factors", "_reasoning", "_tool")
 
     level: RiskLevel
     score: float  # 0.0 - 1.0
-    factors: Dict[str, float]  # Contributing factors
-    reasoning: str  # Human-readable explanation
+    factors: Mapping[str, float]  # Contributing factors
+    _reasoning: Optional[str]
+    _tool: str
+
+    def __init__(
+        self,
+        level: RiskLevel,
+        score: float,
+        factors: Mapping[str, float],
+        reasoning: Optional[str] = None,
+        tool: str = "",
+    ):
+        """Initialize risk score.
+
+        Args:
+            level: Risk level
+            score: Total risk score 0.0 - 1.0
+            factors: Contributing factors
+            reasoning: Human-readable explanation, generated lazily if omitted
+            tool: Tool name used when generating the reasoning
+        """
+        set_attr = object.__setattr__
+        set_attr(self, "level", level)
+        set_attr(self, "score", score)
+        set_attr(self, "factors", factors)
+        set_attr(self, "_reasoning", reasoning)
+        set_attr(self, "_tool", tool)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def reasoning(self) -> str:
+        """Human-readable explanation of the score."""
+        reasoning = self._reasoning
+        if reasoning is None:
+            reasoning = generate_reasoning(self._tool, self.level, self.factors)
+            object.__setattr__(self, "_reasoning", reasoning)
+        return reasoning
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RiskScore):
+            return NotImplemented
+        return (self.level, self.score, dict(self.factors), self.reasoning) == (
+            other.level,
+            other.score,
+            dict(other.factors),
+            other.reasoning,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"RiskScore(level={self.level!r}, score={self.score!r}, "
+            f"factors={dict(self.factors)!r}, reasoning={self.reasoning!r})"
+        )
+
+
+def generate_reasoning(tool: str, level: RiskLevel, factors: Mapping[str, float]) -> str:
+    """Generate human-readable risk reasoning.
+
+    Args:
+        tool: Tool name
+        level: Risk level
+        factors: Risk factors breakdown
+
+    Returns:
+        Reasoning string
+    """
+    lines = [f"Tool '{tool}' assessed as {level.name} risk."]
+
+    # Sort factors by contribution
+    sorted_factors = sorted(factors.items(), key=lambda x: x[1], reverse=True)
+
+    for factor_name, factor_value in sorted_factors:
+        if factor_value > 0.1:
+            percentage = int(factor_value * 100)
+            lines.append(f"  - {factor_name}: {percentage}% contribution")
+
+    return "\n".join(lines)
+
+
+def freeze(obj: Any) -> Any:
+    """Convert nested dicts/lists into hashable tuples for use as cache keys.
+
+    Containers are tagged with their type, so a list and a tuple (or a set and
+    a frozenset) with the same items freeze to different values.
+
+    Args:
+        obj: Value to freeze
+
+    Returns:
+        Hashable equivalent of obj
+    """
+    if isinstance(obj, dict):
+        return (dict, tuple(sorted((k, freeze(v)) for k, v in obj.items())))
+    if isinstance(obj, (list, tuple)):
+        return (type(obj), tuple(freeze(v) for v in obj))
+    if isinstance(obj, (set, frozenset)):
+        return (type(obj), frozenset(freeze(v) for v in obj))
+    return obj
 
 
 class RiskScorer:
     """Calculate risk scores for tool execution plans."""
 
+    # Parameter keys inspected by _assess_parameter_risk
+    _PATH_KEYS = frozenset(["path", "file_path", "directory"])
+    _CMD_KEYS = frozenset(["command", "cmd", "script"])
+    _URL_KEYS = frozenset(["url", "link", "website"])
+    _SQL_KEYS = frozenset(["query", "sql"])
+
+    # Patterns matched against parameter values; case-insensitive matching
+    # avoids a lowercased copy of every value
+    _PATH_RE = re.compile(r"\.\.|~|/etc|/var|c:\\windows", re.IGNORECASE)
+    _CMD_RE = re.compile(r"[;|&`$]")
+    _URL_RE = re.compile(r"localhost|127\.0\.0\.1", re.IGNORECASE)
+    _SQL_RE = re.compile(r"drop|delete|insert|update|exec", re.IGNORECASE)
+
+    # Highest factor _assess_parameter_risk can produce (SQL keywords)
+    _MAX_PARAMETER_RISK = 0.7
+
+    # Number of (tool, parameters, context) results memoized per scorer
+    _CACHE_SIZE = 1024
+
+    # Context keys read by _assess_contextual_risk; the only context in cache keys
+    _CONTEXT_KEYS = ("failed_validations", "recent_high_risk_count", "hour", "is_unusual_action")
+
+    # Base risk per policy risk level, and for tools not listed in any level
+    _LEVEL_BASE_RISK = {"low": 0.1, "medium": 0.4, "high": 0.7, "critical": 1.0}
+    _UNKNOWN_TOOL_RISK = 0.5
+
+    # Weights of the tool, parameter and context factors in the total score
+    _TOOL_WEIGHT = 0.7
+    _PARAMETER_WEIGHT = 0.2
+    _CONTEXT_WEIGHT = 0.1
+
     def __init__(self, config_path: str = "config/policies.yaml"):
         """Initialize risk scorer.
 
@@ -41,6 +187,13 @@ class RiskScorer:
         # Load risk level mappings
         self.risk_mappings = self.policies.get("risk_levels", {})
 
+        # Tool -> base risk table; a tool listed under several levels keeps the
+        # lowest, matching the original low-to-critical lookup order
+        self._base_risks: Dict[str, float] = {}
+        for level, base_risk in reversed(self._LEVEL_BASE_RISK.items()):
+            for listed_tool in self.risk_mappings.get(level) or []:
+                self._base_risks[listed_tool] = base_risk
+
         # Risk score thresholds (adjusted for 70% tool weight)
         # HIGH tools: 0.7 base * 0.7 weight = 0.49 should be HIGH
         # CRITICAL tools: 1.0 base * 0.7 weight = 0.70 should be CRITICAL
@@ -52,21 +205,23 @@ class RiskScorer:
             RiskLevel.LOW: 0.0,  # < 0.15
         }
 
+        # Sorted lower bounds for bisect in _score_to_level; levels[i] covers
+        # scores in [bounds[i-1], bounds[i])
+        self._threshold_levels = [
+            RiskLevel.LOW,
+            RiskLevel.MEDIUM,
+            RiskLevel.HIGH,
+            RiskLevel.CRITICAL,
+        ]
+        self._threshold_bounds = [self.thresholds[level] for level in self._threshold_levels[1:]]
+
+        # Scoring is deterministic given its inputs, so memoize per instance
+        self._calc_cached = lru_cache(maxsize=self._CACHE_SIZE)(self._calculate_frozen)
+
     def _load_policies(self) -> Dict[str, Any]:
         """Load policies from YAML file."""
         try:
-            if self.config_path.exists():
-                with open(self.config_path, "r") as f:
-                    return yaml.safe_load(f)
-
-            module_dir = Path(__file__).parent.parent
-            config_file = module_dir / self.config_path
-
-            if config_file.exists():
-                with open(config_file, "r") as f:
-                    return yaml.safe_load(f)
-
-            return {}
+            return load_policies(self.config_path)
 
         except Exception as e:
             print(f"Warning: Failed to load policies: {e}")
@@ -83,32 +238,124 @@ class RiskScorer:
             context: Optional context (user history, time of day, etc.)
 
         Returns:
-            RiskScore with level and breakdown
+            RiskScore with level and breakdown. Results are memoized, so
+            repeated calls with equal inputs return the same instance.
+        """
+        try:
+            return self._calc_cached(
+                tool, self._param_key(parameters), self._context_key(context or {})
+            )
+        except TypeError:
+            # Unhashable parameter values - score without caching
+            return self._calculate(tool, parameters, context or {})
+
+    def calculate_risks(
+        self, calls: List[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]]
+    ) -> List[RiskScore]:
+        """Calculate risk scores for a batch of tool executions.
+
+        Args:
+            calls: List of (tool, parameters, context) tuples
+
+        Returns:
+            List of RiskScore objects, in the same order as calls
+        """
+        # Bind lookups once for the whole batch
+        calc_cached = self._calc_cached
+        calculate = self._calculate
+        param_key = self._param_key
+        context_key = self._context_key
+        scores: List[RiskScore] = []
+        append = scores.append
+
+        for tool, parameters, context in calls:
+            context = context or {}
+            try:
+                append(calc_cached(tool, param_key(parameters), context_key(context)))
+            except TypeError:
+                append(calculate(tool, parameters, context))
+
+        return scores
+
+    def _calculate_frozen(
+        self,
+        tool: str,
+        param_items: Tuple[Tuple[Any, Any], ...],
+        context_items: Tuple[Tuple[str, Any], ...],
+    ) -> RiskScore:
+        """Cached entry point; rebuilds the inputs from their cache keys."""
+        return self._calculate(tool, dict(param_items), dict(context_items))
+
+    @staticmethod
+    def _param_key(parameters: Dict[str, Any]) -> Tuple[Tuple[Any, Any], ...]:
+        """Cache key covering only the parameters scoring inspects.
+
+        _assess_parameter_risk reads top-level str/int/float values only, so
+        nested values are left out of the key; equal scoring inputs then hit
+        the cache however the rest of the call differs.
+
+        Raises:
+            TypeError: If keys cannot be sorted or values are unhashable
         """
-        factors = {}
+        return tuple(
+            sorted(
+                (key, value)
+                for key, value in parameters.items()
+                if isinstance(value, (str, int, float))
+            )
+        )
+
+    def _context_key(self, context: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+        """Cache key covering only the context keys scoring reads.
+
+        Raises:
+            TypeError: If a read value is unhashable
+        """
+        return tuple((key, context[key]) for key in self._CONTEXT_KEYS if key in context)
+
+    def _calculate(
+        self, tool: str, parameters: Dict[str, Any], context: Dict[str, Any]
+    ) -> RiskScore:
+        """Calculate risk score without consulting the cache.
+
+        Args:
+            tool: Tool name
+            parameters: Tool parameters
+            context: Execution context
 
+        Returns:
+            RiskScore with level and breakdown
+        """
         # Factor 1: Base risk from tool type (70% weight - primary factor)
-        base_risk = self._get_base_risk(tool)
-        factors["tool_type"] = base_risk * 0.7
+        tool_factor = self._get_base_risk(tool) * self._TOOL_WEIGHT
 
         # Factor 2: Parameter risk (20% weight)
-        param_risk = self._assess_parameter_risk(tool, parameters)
-        factors["parameters"] = param_risk * 0.2
+        param_factor = self._assess_parameter_risk(tool, parameters) * self._PARAMETER_WEIGHT
 
         # Factor 3: Contextual risk (10% weight)
-        context_risk = self._assess_contextual_risk(tool, parameters, context or {})
-        factors["context"] = context_risk * 0.1
-
-        # Calculate total score
-        total_score = sum(factors.values())
+        context_factor = (
+            self._assess_contextual_risk(tool, parameters, context) * self._CONTEXT_WEIGHT
+        )
+
+        # Calculate total score from the locals; same summation order as the
+        # factors dict, without iterating it
+        total_score = tool_factor + param_factor + context_factor
+        factors: Dict[str, float] = {
+            "tool_type": tool_factor,
+            "parameters": param_factor,
+            "context": context_factor,
+        }
 
         # Determine risk level
         risk_level = self._score_to_level(total_score)
 
-        # Generate reasoning
-        reasoning = self._generate_reasoning(tool, risk_level, factors)
-
-        return RiskScore(level=risk_level, score=total_score, factors=factors, reasoning=reasoning)
+        # Reasoning is generated lazily on first access
+        return RiskScore(
+            level=risk_level,
+            score=total_score,
+            factors=MappingProxyType(factors),
+            tool=tool,
+        )
 
     def _get_base_risk(self, tool: str) -> float:
         """Get base risk score for a tool.
@@ -119,20 +366,8 @@ class RiskScorer:
         Returns:
             Risk score 0.0 - 1.0
         """
-        tool_upper = tool.upper()
-
-        # Check each risk level
-        if tool_upper in self.risk_mappings.get("low", []):
-            return 0.1
-        elif tool_upper in self.risk_mappings.get("medium", []):
-            return 0.4
-        elif tool_upper in self.risk_mappings.get("high", []):
-            return 0.7
-        elif tool_upper in self.risk_mappings.get("critical", []):
-            return 1.0
-        else:
-            # Unknown tool - treat as medium risk
-            return 0.5
+        # Unknown tool - treat as medium risk
+        return self._base_risks.get(tool.upper(), self._UNKNOWN_TOOL_RISK)
 
     def _assess_parameter_risk(self, tool: str, parameters: Dict[str, Any]) -> float:
         """Assess risk from parameters.
@@ -144,53 +379,39 @@ class RiskScorer:
         Returns:
             Risk score 0.0 - 1.0
         """
-        risk = 0.0
-        risk_factors = []
-
-        # Check for sensitive data in parameters
-        for key, value in parameters.items():
-            if not isinstance(value, str):
-                continue
-
-            value_lower = value.lower()
-
-            # Check for file paths
-            if key in ["path", "file_path", "directory"]:
-                if any(
-                    pattern in value_lower for pattern in ["..", "~", "/etc", "/var", "c:\\windows"]
-                ):
-                    risk_factors.append(0.5)
-
-            # Check for commands
-            if key in ["command", "cmd", "script"]:
-                dangerous_chars = [";", "|", "&", "`", "$"]
-                if any(char in value for char in dangerous_chars):
-                    risk_factors.append(0.6)
-
-            # Check for URLs
-            if key in ["url", "link", "website"]:
-                if "localhost" in value_lower or "127.0.0.1" in value:
-                    risk_factors.append(0.4)
-
-            # Check for database queries
-            if key in ["query", "sql"]:
-                sql_keywords = ["drop", "delete", "insert", "update", "exec"]
-                if any(kw in value_lower for kw in sql_keywords):
-                    risk_factors.append(0.7)
-
-        # Check for large numbers (potential DoS)
-        for key, value in parameters.items():
-            if isinstance(value, (int, float)):
-                if value > 1_000_000:
-                    risk_factors.append(0.3)
+        max_risk: float = 0.0
 
-        # Check for long strings (potential buffer overflow)
+        # Single pass over parameters; the highest possible factor is the SQL
+        # keyword hit (0.7), so we can stop as soon as it is reached.
         for key, value in parameters.items():
-            if isinstance(value, str) and len(value) > 5000:
-                risk_factors.append(0.3)
-
-        # Return maximum risk factor or 0
-        return max(risk_factors) if risk_factors else 0.0
+            if isinstance(value, str):
+                # Check for long strings (potential buffer overflow)
+                if len(value) > 5000 and max_risk < 0.3:
+                    max_risk = 0.3
+
+                if key in self._PATH_KEYS:
+                    # Check for file paths
+                    if max_risk < 0.5 and self._PATH_RE.search(value):
+                        max_risk = 0.5
+                elif key in self._CMD_KEYS:
+                    # Check for commands
+                    if max_risk < 0.6 and self._CMD_RE.search(value):
+                        max_risk = 0.6
+                elif key in self._URL_KEYS:
+                    # Check for URLs
+                    if max_risk < 0.4 and self._URL_RE.search(value):
+                        max_risk = 0.4
+                elif key in self._SQL_KEYS:
+                    # Check for database queries
+                    if self._SQL_RE.search(value):
+                        return self._MAX_PARAMETER_RISK
+
+            elif isinstance(value, (int, float)):
+                # Check for large numbers (potential DoS)
+                if value > 1_000_000 and max_risk < 0.3:
+                    max_risk = 0.3
+
+        return max_risk
 
     def _assess_contextual_risk(
         self, tool: str, parameters: Dict[str, Any], context: Dict[str, Any]
@@ -205,26 +426,28 @@ class RiskScorer:
         Returns:
             Risk score 0.0 - 1.0
         """
-        risk = 0.0
+        # Every check's default is risk-free
+        if not context:
+            return 0.0
+
+        get = context.get
+        risk: float = 0.0
 
         # Check if user has history of failed validations
-        failed_validations = context.get("failed_validations", 0)
-        if failed_validations > 5:
+        if get("failed_validations", 0) > 5:
             risk += 0.3
 
         # Check if executing multiple high-risk actions
-        recent_high_risk = context.get("recent_high_risk_count", 0)
-        if recent_high_risk > 3:
+        if get("recent_high_risk_count", 0) > 3:
             risk += 0.2
 
         # Check time of day (unusual hours increase risk)
-        hour = context.get("hour", 12)
+        hour = get("hour", 12)
         if hour < 6 or hour > 23:
             risk += 0.1
 
         # Check if action is unusual for user
-        is_unusual = context.get("is_unusual_action", False)
-        if is_unusual:
+        if get("is_unusual_action", False):
             risk += 0.2
 
         return min(risk, 1.0)
@@ -238,14 +461,7 @@ class RiskScorer:
         Returns:
             RiskLevel enum
         """
-        if score >= self.thresholds[RiskLevel.CRITICAL]:
-            return RiskLevel.CRITICAL
-        elif score >= self.thresholds[RiskLevel.HIGH]:
-            return RiskLevel.HIGH
-        elif score >= self.thresholds[RiskLevel.MEDIUM]:
-            return RiskLevel.MEDIUM
-        else:
-            return RiskLevel.LOW
+        return self._threshold_levels[bisect_right(self._threshold_bounds, score)]
 
     def _generate_reasoning(self, tool: str, level: RiskLevel, factors: Dict[str, float]) -> str:
         """Generate human-readable risk reasoning.
@@ -258,17 +474,7 @@ class RiskScorer:
         Returns:
             Reasoning string
         """
-        lines = [f"Tool '{tool}' assessed as {level.value} risk."]
-
-        # Sort factors by contribution
-        sorted_factors = sorted(factors.items(), key=lambda x: x[1], reverse=True)
-
-        for factor_name, factor_value in sorted_factors:
-            if factor_value > 0.1:
-                percentage = int(factor_value * 100)
-                lines.append(f"  - {factor_name}: {percentage}% contribution")
-
-        return "\n".join(lines)
+        return generate_reasoning(tool, level, factors)
 
     def requires_confirmation(self, risk_score: RiskScore) -> bool:
         """Check if risk level requires user confirmation.
@@ -279,7 +485,7 @@ class RiskScorer:
         Returns:
             True if confirmation required
         """
-        return risk_score.level in [RiskLevel.HIGH, RiskLevel.CRITICAL]
+        return risk_score.level >= RiskLevel.HIGH
 
     def should_block(self, risk_score: RiskScore) -> bool:
         """Check if risk level should block execution.
@@ -1,9 +1,23 @@
 """Input sanitization to prevent injection attacks."""
 
+import os
 import re
-from typing import Dict, Any, List, Tuple
+import unicodedata
+from typing import Dict, Any, Iterable, List, Optional, Pattern, Tuple, Union
 from pathlib import Path
-import yaml
+
+from .pii_scanners import LINEAR_PATTERNS, LinearPattern
+from .policy_loader import load_policies
+
+try:
+    import re2
+except ImportError:  # google-re2 is optional; a combined `re` prefilter is used instead
+    re2 = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; a combined `re` prefilter is used instead
+    ahocorasick = None
 
 
 class SanitizationError(Exception):
@@ -12,9 +26,121 @@ class SanitizationError(Exception):
     pass
 
 
+# Applied after NFKC normalization: drop zero-width characters used to split
+# tokens ("java\u200bscript:") and fold slash look-alikes NFKC leaves alone
+_NORMALIZE_TRANS = str.maketrans(
+    {
+        "\u200b": None,  # zero width space
+        "\u200c": None,  # zero width non-joiner
+        "\u200d": None,  # zero width joiner
+        "\u2060": None,  # word joiner
+        "\ufeff": None,  # zero width no-break space
+        "\u2044": "/",  # fraction slash
+        "\u2215": "/",  # division slash
+        "\u29f8": "/",  # big solidus
+    }
+)
+
+
+class TokenScanner:
+    """Find which of a list of literal blocklist tokens occurs in a string.
+
+    Scans the string once (Aho-Corasick automaton when pyahocorasick is
+    installed, otherwise a regex alternation that rejects clean strings in one
+    pass) instead of one substring search per token.
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        """Initialize token scanner.
+
+        Args:
+            tokens: (pattern, match_form) pairs; match_form is searched for and
+                pattern is reported back
+        """
+        self.tokens = tokens
+        self._automaton = None
+        self._prefilter: Optional[Pattern[str]] = None
+
+        if not tokens:
+            return
+
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for index, (_, token) in enumerate(tokens):
+                if token not in automaton:
+                    automaton.add_word(token, index)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            self._prefilter = re.compile("|".join(re.escape(token) for _, token in tokens))
+
+    def find(self, text: str) -> Optional[str]:
+        """Return the first configured pattern whose token occurs in text.
+
+        Args:
+            text: Text to scan, already in match form (e.g. case-folded)
+
+        Returns:
+            Matching pattern, or None if no token occurs
+        """
+        if not self.tokens:
+            return None
+
+        if self._automaton is not None:
+            first = min((index for _, index in self._automaton.iter(text)), default=None)
+            return None if first is None else self.tokens[first][0]
+
+        if self._prefilter is not None and not self._prefilter.search(text):
+            return None
+        for pattern, token in self.tokens:
+            if token in text:
+                return pattern
+        return None
+
+    def contains(self, text: str) -> bool:
+        """Return whether any token occurs in text.
+
+        Cheaper than find() when the matching pattern is not needed: stops
+        at the first occurrence instead of ranking them.
+
+        Args:
+            text: Text to scan, already in match form (e.g. case-folded)
+
+        Returns:
+            True if some token occurs in text
+        """
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        if self._prefilter is not None:
+            return self._prefilter.search(text) is not None
+        return False
+
+
 class InputSanitizer:
     """Sanitize inputs to prevent injection attacks."""
 
+    # <script> blocks, javascript: protocol and on* event handlers in one pass
+    _XSS_RE = re.compile(
+        r"<script[^>]*>.*?</script>|javascript:|\bon\w+\s*=", re.IGNORECASE | re.DOTALL
+    )
+
+    # Lowercased parameter keys that get type-specific string checks
+    _SQL_KEYS = frozenset(["query", "sql", "statement"])
+    _CMD_KEYS = frozenset(["command", "cmd", "script", "shell"])
+    _PATH_KEYS = frozenset(["path", "file_path", "directory", "filename"])
+    _URL_KEYS = frozenset(["url", "link", "website", "uri"])
+    SCREENED_KEYS = _SQL_KEYS | _CMD_KEYS | _PATH_KEYS | _URL_KEYS
+
+    # Removal passes before a still-matching string is rejected; bounds the
+    # work on deliberately nested payloads to a few linear scans
+    _XSS_MAX_PASSES = 3
+
+    # Characters without which _sanitize_xss leaves a string unchanged
+    XSS_TRIGGERS = ("<", ":", "=")
+
+    # Regex constructs whose result can change when text is joined with others
+    _CONTEXT_SENSITIVE_TOKENS = ("^", "$", "\\A", "\\Z", "(?=", "(?!", "(?<")
+
     def __init__(self, config_path: str = "config/policies.yaml"):
         """Initialize input sanitizer.
 
@@ -25,26 +151,139 @@ class InputSanitizer:
         self.policies = self._load_policies()
         self.param_rules = self.policies.get("parameter_rules", {})
 
+        # Blocklist scanners over case-folded tokens (commands stay
+        # case-sensitive); error messages report the configured pattern
+        self._sql_blocked = TokenScanner(
+            self._fold_patterns("database_queries", "blocked_patterns")
+        )
+        self._path_blocked = TokenScanner(self._fold_patterns("file_paths", "blocked_patterns"))
+        self._url_blocked = TokenScanner(self._fold_patterns("urls", "blocked_domains"))
+        self._command_blocked = TokenScanner(
+            [
+                (pattern, pattern)
+                for pattern in self.param_rules.get("system_commands", {}).get(
+                    "blocked_patterns", []
+                )
+            ]
+        )
+
+        # Compiled PII patterns as (pii_type, pattern, mask), in policy order,
+        # plus a single-pass scanner telling which of them can match
+        self._pii_patterns = self._compile_pii_patterns()
+        self._pii_set = self._build_pii_set()
+        self._pii_prefilter = self._build_pii_prefilter()
+        self._pii_linear = [p for _, p, _ in self._pii_patterns if isinstance(p, LinearPattern)]
+
+        # Several texts can share one screening scan when joined by newlines,
+        # unless a pattern's anchors or lookarounds would see the other texts
+        self._pii_joinable = not any(
+            token in pattern.pattern
+            for _, pattern, _ in self._pii_patterns
+            for token in self._CONTEXT_SENSITIVE_TOKENS
+        )
+
     def _load_policies(self) -> Dict[str, Any]:
         """Load policies from YAML file."""
         try:
-            if self.config_path.exists():
-                with open(self.config_path, "r") as f:
-                    return yaml.safe_load(f)
-
-            module_dir = Path(__file__).parent.parent
-            config_file = module_dir / self.config_path
-
-            if config_file.exists():
-                with open(config_file, "r") as f:
-                    return yaml.safe_load(f)
-
-            return {}
+            return load_policies(self.config_path)
 
         except Exception as e:
             print(f"Warning: Failed to load policies: {e}")
             return {}
 
+    def _fold_patterns(self, rule: str, field: str) -> List[Tuple[str, str]]:
+        """Pair each configured pattern with its case-folded form.
+
+        Args:
+            rule: Parameter rule section name
+            field: List field inside the rule section
+
+        Returns:
+            List of (pattern, folded_pattern) tuples
+        """
+        patterns = self.param_rules.get(rule, {}).get(field, [])
+        return [(pattern, pattern.casefold()) for pattern in patterns]
+
+    def _compile_pii_patterns(
+        self,
+    ) -> List[Tuple[str, Union[Pattern[str], LinearPattern], str]]:
+        """Compile the configured PII patterns once.
+
+        Patterns with a linear-time scanner (see pii_scanners) use it instead
+        of `re`, which backtracks quadratically on some adversarial inputs.
+
+        Returns:
+            List of (pii_type, compiled_pattern, mask) tuples
+        """
+        compiled: List[Tuple[str, Union[Pattern[str], LinearPattern], str]] = []
+        for pii_type, config in self.policies.get("pii_patterns", {}).items():
+            pattern = config.get("pattern")
+            if not pattern:
+                continue
+            try:
+                linear = LINEAR_PATTERNS.get(pattern)
+                matcher = linear() if linear else re.compile(pattern)
+                compiled.append((pii_type, matcher, config.get("mask", "***")))
+            except re.error as e:
+                print(f"Warning: Invalid PII pattern for {pii_type}: {e}")
+        return compiled
+
+    def _build_pii_set(self) -> Optional[Any]:
+        """Build an RE2 set that reports every matching PII pattern in one scan.
+
+        Returns:
+            Compiled re2.Set, or None if re2 is unavailable or rejects a pattern
+        """
+        if re2 is None or not self._pii_patterns:
+            return None
+
+        pii_set = re2.Set.SearchSet(re2.Options())
+        try:
+            for _, pattern, _ in self._pii_patterns:
+                pii_set.Add(pattern.pattern)
+            pii_set.Compile()
+        except Exception:
+            return None
+        return pii_set
+
+    def _build_pii_prefilter(self) -> Optional[Pattern[str]]:
+        """Combine the `re`-backed PII patterns into one regex to reject clean text in one scan.
+
+        Returns:
+            Compiled alternation, or None if the patterns cannot be combined
+        """
+        regexes = [p.pattern for _, p, _ in self._pii_patterns if not isinstance(p, LinearPattern)]
+        if not regexes:
+            return re.compile(r"(?!)")
+        try:
+            return re.compile("|".join(f"(?:{pattern})" for pattern in regexes))
+        except re.error:
+            return None
+
+    def _matching_pii_indices(self, text: str) -> Iterable[int]:
+        """Indices into self._pii_patterns of patterns that may match text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Pattern indices in policy order
+        """
+        # RE2's \d, \w and \b are ASCII-only while the `re` patterns are
+        # Unicode-aware, so only ASCII text can be screened by the set
+        if self._pii_set is not None and text.isascii():
+            return sorted(self._pii_set.Match(text) or ())
+
+        # Otherwise the combined regex screens the `re` patterns and the
+        # linear scanners screen themselves
+        if (
+            self._pii_prefilter is not None
+            and not self._pii_prefilter.search(text)
+            and not any(pattern.search(text) for pattern in self._pii_linear)
+        ):
+            return ()
+        return range(len(self._pii_patterns))
+
     def sanitize_parameters(
         self, tool: str, parameters: Dict[str, Any]
     ) -> Tuple[Dict[str, Any], List[str]]:
@@ -60,39 +299,61 @@ class InputSanitizer:
         Raises:
             SanitizationError: If sanitization fails
         """
-        sanitized = {}
-        warnings = []
+        sanitized: Dict[str, Any] = {}
+        warnings: List[str] = []
+
+        # Walk nested dicts with an explicit stack of (output_dict, key, value).
+        # Items are pushed in reverse so they are processed in original order.
+        stack = [(sanitized, key, value) for key, value in reversed(parameters.items())]
 
-        for key, value in parameters.items():
+        while stack:
+            out, key, value = stack.pop()
             try:
                 if isinstance(value, str):
                     sanitized_value, param_warnings = self._sanitize_string(key, value)
-                    sanitized[key] = sanitized_value
+                    out[key] = sanitized_value
                     warnings.extend(param_warnings)
                 elif isinstance(value, (int, float)):
-                    sanitized[key] = self._sanitize_number(key, value)
+                    out[key] = self._sanitize_number(key, value)
                 elif isinstance(value, dict):
-                    # Recursively sanitize nested dicts
-                    nested_sanitized, nested_warnings = self.sanitize_parameters(tool, value)
-                    sanitized[key] = nested_sanitized
-                    warnings.extend(nested_warnings)
+                    # Sanitize nested dicts into a new output dict
+                    nested: Dict[str, Any] = {}
+                    out[key] = nested
+                    stack.extend((nested, k, v) for k, v in reversed(value.items()))
                 elif isinstance(value, list):
                     # Sanitize list items
-                    sanitized[key] = [
+                    out[key] = [
                         self._sanitize_string(key, item)[0] if isinstance(item, str) else item
                         for item in value
                     ]
                 else:
-                    sanitized[key] = value
+                    out[key] = value
 
             except SanitizationError:
                 raise
             except Exception as e:
                 warnings.append(f"Failed to sanitize parameter '{key}': {e}")
-                sanitized[key] = value
+                out[key] = value
 
         return sanitized, warnings
 
+    def sanitize_batch(
+        self, items: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Tuple[Dict[str, Any], List[str]]]:
+        """Sanitize parameters for a batch of tool calls.
+
+        Args:
+            items: List of (tool, parameters) tuples
+
+        Returns:
+            List of (sanitized_params, warnings) tuples, in the same order as items
+
+        Raises:
+            SanitizationError: If any item fails sanitization
+        """
+        sanitize = self.sanitize_parameters
+        return [sanitize(tool, parameters) for tool, parameters in items]
+
     def _sanitize_string(self, key: str, value: str) -> Tuple[str, List[str]]:
         """Sanitize a string parameter.
 
@@ -106,27 +367,34 @@ class InputSanitizer:
         Raises:
             SanitizationError: If value is unsafe
         """
-        warnings = []
+        warnings: List[str] = []
+
+        # Normalize once so every check below sees full-width and look-alike
+        # characters in their plain form; ASCII is already normalized
+        if not value.isascii():
+            value = unicodedata.normalize("NFKC", value).translate(_NORMALIZE_TRANS)
+
         sanitized = value
+        key_lower = key.lower()
 
         # Check for SQL injection
-        if key.lower() in ["query", "sql", "statement"]:
-            sanitized, sql_warnings = self._sanitize_sql(value)
+        if key_lower in self._SQL_KEYS:
+            sanitized, sql_warnings = self._sanitize_sql(value, value.casefold())
             warnings.extend(sql_warnings)
 
-        # Check for command injection
-        elif key.lower() in ["command", "cmd", "script", "shell"]:
+        # Check for command injection (case-sensitive blocklist)
+        elif key_lower in self._CMD_KEYS:
             sanitized, cmd_warnings = self._sanitize_command(value)
             warnings.extend(cmd_warnings)
 
         # Check for path traversal
-        elif key.lower() in ["path", "file_path", "directory", "filename"]:
-            sanitized, path_warnings = self._sanitize_path(value)
+        elif key_lower in self._PATH_KEYS:
+            sanitized, path_warnings = self._sanitize_path(value, value.casefold())
             warnings.extend(path_warnings)
 
         # Check for URL injection
-        elif key.lower() in ["url", "link", "website", "uri"]:
-            sanitized, url_warnings = self._sanitize_url(value)
+        elif key_lower in self._URL_KEYS:
+            sanitized, url_warnings = self._sanitize_url(value, value.casefold())
             warnings.extend(url_warnings)
 
         # General XSS protection
@@ -134,11 +402,12 @@ class InputSanitizer:
 
         return sanitized, warnings
 
-    def _sanitize_sql(self, value: str) -> Tuple[str, List[str]]:
+    def _sanitize_sql(self, value: str, value_folded: str) -> Tuple[str, List[str]]:
         """Sanitize SQL query.
 
         Args:
             value: SQL query string
+            value_folded: Case-folded value
 
         Returns:
             Tuple of (sanitized_value, warnings)
@@ -146,7 +415,7 @@ class InputSanitizer:
         Raises:
             SanitizationError: If query contains dangerous patterns
         """
-        warnings = []
+        warnings: List[str] = []
         rules = self.param_rules.get("database_queries", {})
 
         # Check length
@@ -155,12 +424,9 @@ class InputSanitizer:
             raise SanitizationError(f"SQL query exceeds max length ({max_length})")
 
         # Check for dangerous patterns
-        blocked_patterns = rules.get("blocked_patterns", [])
-        value_upper = value.upper()
-
-        for pattern in blocked_patterns:
-            if pattern.upper() in value_upper:
-                raise SanitizationError(f"SQL query contains blocked pattern: {pattern}")
+        pattern = self._sql_blocked.find(value_folded)
+        if pattern is not None:
+            raise SanitizationError(f"SQL query contains blocked pattern: {pattern}")
 
         # Escape single quotes
         sanitized = value.replace("'", "''")
@@ -179,7 +445,7 @@ class InputSanitizer:
         Raises:
             SanitizationError: If command contains dangerous patterns
         """
-        warnings = []
+        warnings: List[str] = []
         rules = self.param_rules.get("system_commands", {})
 
         # Check length
@@ -188,19 +454,18 @@ class InputSanitizer:
             raise SanitizationError(f"Command exceeds max length ({max_length})")
 
         # Check for dangerous patterns
-        blocked_patterns = rules.get("blocked_patterns", [])
-
-        for pattern in blocked_patterns:
-            if pattern in value:
-                raise SanitizationError(f"Command contains blocked pattern: {pattern}")
+        pattern = self._command_blocked.find(value)
+        if pattern is not None:
+            raise SanitizationError(f"Command contains blocked pattern: {pattern}")
 
         return value, warnings
 
-    def _sanitize_path(self, value: str) -> Tuple[str, List[str]]:
+    def _sanitize_path(self, value: str, value_folded: str) -> Tuple[str, List[str]]:
         """Sanitize file path.
 
         Args:
             value: File path
+            value_folded: Case-folded value
 
         Returns:
             Tuple of (sanitized_value, warnings)
@@ -208,7 +473,7 @@ class InputSanitizer:
         Raises:
             SanitizationError: If path contains dangerous patterns
         """
-        warnings = []
+        warnings: List[str] = []
         rules = self.param_rules.get("file_paths", {})
 
         # Check length
@@ -217,22 +482,22 @@ class InputSanitizer:
             raise SanitizationError(f"Path exceeds max length ({max_length})")
 
         # Check for path traversal
-        blocked_patterns = rules.get("blocked_patterns", [])
-        value_lower = value.lower()
-
-        for pattern in blocked_patterns:
-            if pattern.lower() in value_lower:
-                raise SanitizationError(f"Path contains blocked pattern: {pattern}")
+        pattern = self._path_blocked.find(value_folded)
+        if pattern is not None:
+            raise SanitizationError(f"Path contains blocked pattern: {pattern}")
 
-        # Normalize path
+        # Normalize path lexically; resolving against the filesystem (symlinks,
+        # cwd) costs stat() calls and is opt-in via the resolve_symlinks rule
         try:
-            normalized = str(Path(value).resolve())
+            if rules.get("resolve_symlinks", False):
+                normalized = str(Path(value).resolve())
+            else:
+                normalized = os.path.normpath(value)
 
             # Additional check on normalized path
-            normalized_lower = normalized.lower()
-            for pattern in blocked_patterns:
-                if pattern.lower() in normalized_lower:
-                    raise SanitizationError(f"Normalized path contains blocked pattern: {pattern}")
+            pattern = self._path_blocked.find(normalized.casefold())
+            if pattern is not None:
+                raise SanitizationError(f"Normalized path contains blocked pattern: {pattern}")
 
             return normalized, warnings
 
@@ -240,11 +505,12 @@ class InputSanitizer:
             warnings.append(f"Failed to normalize path: {e}")
             return value, warnings
 
-    def _sanitize_url(self, value: str) -> Tuple[str, List[str]]:
+    def _sanitize_url(self, value: str, value_folded: str) -> Tuple[str, List[str]]:
         """Sanitize URL.
 
         Args:
             value: URL string
+            value_folded: Case-folded value
 
         Returns:
             Tuple of (sanitized_value, warnings)
@@ -252,7 +518,7 @@ class InputSanitizer:
         Raises:
             SanitizationError: If URL is invalid or dangerous
         """
-        warnings = []
+        warnings: List[str] = []
         rules = self.param_rules.get("urls", {})
 
         # Check length
@@ -262,16 +528,13 @@ class InputSanitizer:
 
         # Check scheme
         allowed_schemes = rules.get("allowed_schemes", ["http", "https"])
-        if not any(value.lower().startswith(f"{scheme}://") for scheme in allowed_schemes):
+        if not any(value_folded.startswith(f"{scheme}://") for scheme in allowed_schemes):
             raise SanitizationError(f"URL scheme not allowed. Allowed: {allowed_schemes}")
 
         # Check for blocked domains
-        blocked_domains = rules.get("blocked_domains", [])
-        value_lower = value.lower()
-
-        for domain in blocked_domains:
-            if domain in value_lower:
-                raise SanitizationError(f"URL contains blocked domain: {domain}")
+        domain = self._url_blocked.find(value_folded)
+        if domain is not None:
+            raise SanitizationError(f"URL contains blocked domain: {domain}")
 
         return value, warnings
 
@@ -283,16 +546,25 @@ class InputSanitizer:
 
         Returns:
             Sanitized string
-        """
-        # Remove <script> tags
-        value = re.sub(r"<script[^>]*>.*?</script>", "", value, flags=re.IGNORECASE | re.DOTALL)
-
-        # Remove javascript: protocol
-        value = re.sub(r"javascript:", "", value, flags=re.IGNORECASE)
-
-        # Remove on* event handlers
-        value = re.sub(r"\bon\w+\s*=", "", value, flags=re.IGNORECASE)
 
+        Raises:
+            SanitizationError: If removals keep exposing new payloads
+        """
+        # Every XSS pattern needs "<", ":" or "="; memchr-speed screen lets the
+        # common clean string skip the regex engine entirely
+        if "<" not in value and ":" not in value and "=" not in value:
+            return value
+
+        # Repeat so removals cannot splice together a new payload (e.g.
+        # "jav<script></script>ascript:"); clean input takes one scan. Input
+        # that still matches after a few passes is nested on purpose
+        for _ in range(self._XSS_MAX_PASSES):
+            value, count = self._XSS_RE.subn("", value)
+            if not count:
+                return value
+
+        if self._XSS_RE.search(value):
+            raise SanitizationError("Nested XSS payload detected")
         return value
 
     def _sanitize_number(self, key: str, value: float) -> float:
@@ -327,15 +599,44 @@ class InputSanitizer:
         Returns:
             List of (pii_type, matched_value) tuples
         """
-        pii_found = []
-        pii_patterns = self.policies.get("pii_patterns", {})
+        return self._find_pii(text, self._matching_pii_indices(text))
 
-        for pii_type, config in pii_patterns.items():
-            pattern = config.get("pattern")
-            if pattern:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    pii_found.append((pii_type, match))
+    def detect_pii_batch(self, texts: List[str]) -> List[List[Tuple[str, str]]]:
+        """Detect PII in several texts, screening them all in one scan.
+
+        Args:
+            texts: Texts to scan
+
+        Returns:
+            List of (pii_type, matched_value) lists, in the same order as texts
+        """
+        if len(texts) < 2 or not self._pii_joinable:
+            return [self.detect_pii(text) for text in texts]
+
+        # Only patterns found somewhere in the joined texts need per-text scans
+        indices = self._matching_pii_indices("\n".join(texts))
+        if not indices:
+            return [[] for _ in texts]
+
+        return [self._find_pii(text, indices) for text in texts]
+
+    def _find_pii(self, text: str, indices: Iterable[int]) -> List[Tuple[str, str]]:
+        """Collect matches of the given PII patterns in text.
+
+        Args:
+            text: Text to scan
+            indices: Indices into self._pii_patterns to run
+
+        Returns:
+            List of (pii_type, matched_value) tuples
+        """
+        pii_found: List[Tuple[str, str]] = []
+        pii_patterns = self._pii_patterns
+
+        for index in indices:
+            pii_type, pattern, _ = pii_patterns[index]
+            for match in pattern.findall(text):
+                pii_found.append((pii_type, match))
 
         return pii_found
 
@@ -348,14 +649,11 @@ class InputSanitizer:
         Returns:
             Text with PII masked
         """
+        # Only run substitution passes for patterns the single scan reported
         masked = text
-        pii_patterns = self.policies.get("pii_patterns", {})
-
-        for pii_type, config in pii_patterns.items():
-            pattern = config.get("pattern")
-            mask = config.get("mask", "***")
-
-            if pattern:
-                masked = re.sub(pattern, mask, masked)
+        pii_patterns = self._pii_patterns
+        for index in self._matching_pii_indices(text):
+            _, pattern, mask = pii_patterns[index]
+            masked = pattern.sub(mask, masked)
 
         return masked
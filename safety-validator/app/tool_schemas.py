@@ -0,0 +1,101 @@
+"""Fast-path parameter checks for tools with fully declared schemas."""
+
+import re
+from typing import Any, Callable, Collection, Dict, List, Tuple
+
+from .sanitizers import InputSanitizer
+
+# InputSanitizer._sanitize_number rejects numbers beyond this magnitude
+_MAX_NUMBER = 1e15
+
+FastScreen = Callable[[Dict[str, Any]], bool]
+
+
+def compile_tool_schema(
+    fields: Dict[str, Dict[str, Any]],
+    detect_pii: Callable[[str], List[Tuple[str, str]]],
+    screened_keys: Collection[str],
+) -> FastScreen:
+    """Build a predicate for parameters that full screening would pass unchanged.
+
+    The predicate only accepts values the sanitizer and parameter checks
+    cannot alter or warn about: bounded numbers and booleans, and ASCII
+    strings fully matching a declared pattern, free of XSS trigger
+    characters and PII, under keys without type-specific checks.
+
+    Args:
+        fields: Parameter name -> spec (type, required, min/max, pattern, max_length)
+        detect_pii: PII detector used to reject strings that would be warned about
+        screened_keys: Lowercased keys that get type-specific checks
+
+    Returns:
+        Callable returning True if parameters can skip full screening
+
+    Raises:
+        ValueError: If a field spec is unsupported or not provably safe
+    """
+    checks: Dict[str, Callable[[Any], bool]] = {}
+    required = set()
+
+    for name, spec in (fields or {}).items():
+        spec = spec or {}
+        checks[name] = _compile_field(name, spec, detect_pii, screened_keys)
+        if spec.get("required", True):
+            required.add(name)
+
+    def fast_screen(parameters: Dict[str, Any]) -> bool:
+        for key, value in parameters.items():
+            check = checks.get(key)
+            if check is None or not check(value):
+                return False
+        return required.issubset(parameters)
+
+    return fast_screen
+
+
+def _compile_field(
+    name: str,
+    spec: Dict[str, Any],
+    detect_pii: Callable[[str], List[Tuple[str, str]]],
+    screened_keys: Collection[str],
+) -> Callable[[Any], bool]:
+    """Build the check for a single declared parameter."""
+    kind = spec.get("type")
+
+    if kind in ("integer", "number"):
+        low = spec.get("min", -_MAX_NUMBER)
+        high = spec.get("max", _MAX_NUMBER)
+        if not -_MAX_NUMBER <= low <= high <= _MAX_NUMBER:
+            raise ValueError(f"Invalid bounds for '{name}': [{low}, {high}]")
+
+        # Exact type checks keep bools out of numeric fields; NaN and
+        # infinities fail the bounds comparison
+        types = (int,) if kind == "integer" else (int, float)
+        return lambda value: type(value) in types and low <= value <= high
+
+    if kind == "boolean":
+        return lambda value: type(value) is bool
+
+    if kind == "string":
+        if name.lower() in screened_keys:
+            raise ValueError(f"String parameter '{name}' has type-specific checks")
+        if "pattern" not in spec:
+            raise ValueError(f"String parameter '{name}' needs a pattern")
+
+        fullmatch = re.compile(spec["pattern"]).fullmatch
+        max_length = spec.get("max_length", 256)
+        triggers = InputSanitizer.XSS_TRIGGERS
+
+        def check_string(value: Any) -> bool:
+            return (
+                type(value) is str
+                and len(value) <= max_length
+                and value.isascii()
+                and fullmatch(value) is not None
+                and not any(char in value for char in triggers)
+                and not detect_pii(value)
+            )
+
+        return check_string
+
+    raise ValueError(f"Unsupported type for '{name}': {kind}")
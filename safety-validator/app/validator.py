@@ -1,13 +1,135 @@
 """Main safety validator for execution plans."""
 
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+import asyncio
+import copy
+import hashlib
+import math
+import re
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Any, Final, Iterator, Optional, List, Tuple, Union
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from datetime import datetime
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
 
-from .risk_scorer import RiskScorer, RiskLevel, RiskScore
+from .risk_scorer import RiskScorer, RiskLevel, RiskScore, freeze
 from .sanitizers import InputSanitizer, SanitizationError
 from .allow_lists import AllowListManager
+from .policy_loader import resolve_config_path
+from .tool_schemas import FastScreen, compile_tool_schema
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; keys fall back to repr(freeze(parameters))
+    orjson = None
+
+# Canonical, key-sorted serialization for screening cache keys. Types orjson
+# would otherwise stringify are passed through so they raise and take the
+# freeze() fallback instead of colliding with plain strings.
+_ORJSON_KEY_OPTIONS = (
+    orjson.OPT_SORT_KEYS
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+    if orjson
+    else 0
+)
+
+
+def _orjson_keyable(obj: Any) -> bool:
+    """Check that orjson serializes obj without conflating values.
+
+    orjson writes tuples exactly like lists, and NaN and infinities as null.
+
+    Args:
+        obj: Tool parameters or a nested value
+
+    Returns:
+        False if obj is or contains a tuple or a non-finite float
+    """
+    if isinstance(obj, tuple):
+        return False
+    if isinstance(obj, float):
+        return math.isfinite(obj)
+    if isinstance(obj, dict):
+        return all(_orjson_keyable(value) for value in obj.values())
+    if isinstance(obj, list):
+        return all(_orjson_keyable(value) for value in obj)
+    return True
+
+
+# Leaf types whose repr() identifies their value, so repr(freeze(...)) is a
+# safe cache key; floats must additionally be finite
+_REPR_KEY_TYPES = frozenset(
+    [str, int, bool, float, bytes, type(None), Decimal, date, datetime, dt_time, timedelta]
+)
+
+
+def _repr_keyable(obj: Any) -> bool:
+    """Check that repr(freeze(obj)) identifies obj by value.
+
+    Args:
+        obj: Tool parameters or a nested value
+
+    Returns:
+        True if obj only holds containers and value-repr leaf types
+    """
+    if isinstance(obj, dict):
+        return all(_repr_keyable(key) and _repr_keyable(value) for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return all(_repr_keyable(value) for value in obj)
+    if type(obj) is float:
+        return math.isfinite(obj)
+    return type(obj) in _REPR_KEY_TYPES
+
+
+# Components shared by validators using the same policy file version
+_SHARED_COMPONENTS: Dict[
+    Tuple[str, Optional[int], Optional[int]], Tuple[RiskScorer, InputSanitizer, AllowListManager]
+] = {}
+_SHARED_COMPONENTS_LOCK = threading.Lock()
+
+
+def _shared_components(
+    config_path: str,
+) -> Tuple[RiskScorer, InputSanitizer, AllowListManager]:
+    """Get the risk scorer, sanitizer and allow list for a policy file.
+
+    The components are read-only after construction, so validators using the
+    same file share one set instead of re-parsing policies and recompiling
+    patterns. A changed file (mtime or size) gets a fresh set.
+
+    Args:
+        config_path: Path to policies configuration
+
+    Returns:
+        Tuple of (risk_scorer, sanitizer, allow_list)
+    """
+    path = resolve_config_path(Path(config_path))
+    if path is None:
+        key: Tuple[str, Optional[int], Optional[int]] = (config_path, None, None)
+    else:
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    with _SHARED_COMPONENTS_LOCK:
+        components = _SHARED_COMPONENTS.get(key)
+        if components is None:
+            components = (
+                RiskScorer(config_path),
+                InputSanitizer(config_path),
+                AllowListManager(config_path),
+            )
+            # Drop components built for earlier versions of the same file
+            for stale in [k for k in _SHARED_COMPONENTS if k[0] == key[0]]:
+                del _SHARED_COMPONENTS[stale]
+            _SHARED_COMPONENTS[key] = components
+
+    return components
 
 
 class ValidationStatus(str, Enum):
@@ -19,7 +141,12 @@ class ValidationStatus(str, Enum):
     SANITIZED = "SANITIZED"  # Approved with sanitized parameters
 
 
-@dataclass
+# Statuses that allow execution to proceed; a tuple, so membership checks
+# hit the identity fast path instead of building a list per call
+_SAFE_STATUSES: Final = (ValidationStatus.APPROVED, ValidationStatus.SANITIZED)
+
+
+@dataclass(slots=True)
 class ValidationResult:
     """Result of safety validation."""
 
@@ -30,11 +157,16 @@ class ValidationResult:
     blocked_reason: Optional[str] = None
     requires_confirmation: bool = False
     confirmation_message: Optional[str] = None
-    timestamp: datetime = None
+    timestamp: Optional[float] = None  # Unix time (seconds)
 
     def __post_init__(self):
         if self.timestamp is None:
-            self.timestamp = datetime.utcnow()
+            self.timestamp = time.time()
+
+    @property
+    def iso_timestamp(self) -> str:
+        """Timestamp as an ISO 8601 UTC string, for display and serialization."""
+        return datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat()
 
     def is_safe(self) -> bool:
         """Check if execution is safe to proceed.
@@ -42,7 +174,7 @@ class ValidationResult:
         Returns:
             True if APPROVED or SANITIZED, False otherwise
         """
-        return self.status in [ValidationStatus.APPROVED, ValidationStatus.SANITIZED]
+        return self.status in _SAFE_STATUSES
 
     def needs_confirmation(self) -> bool:
         """Check if user confirmation is needed.
@@ -53,6 +185,21 @@ class ValidationResult:
         return self.status == ValidationStatus.REQUIRES_CONFIRMATION
 
 
+@dataclass(slots=True)
+class _HistoryTallies:
+    """Running counters over a user's validation history.
+
+    Maintained incrementally by SafetyValidator._record_validation so context
+    enrichment, rate limiting and stats never rescan the history.
+    """
+
+    blocked_last_10: int = 0
+    high_risk_last_20: int = 0
+    status_counts: Dict[ValidationStatus, int] = field(default_factory=dict)
+    risk_score_sum: float = 0.0
+    recent_timestamps: Deque[float] = field(default_factory=deque)  # time.monotonic()
+
+
 class SafetyValidator:
     """Main safety validator for execution plans.
 
@@ -60,20 +207,112 @@ class SafetyValidator:
     they are sent to Module 7 (Action Executor).
     """
 
-    def __init__(self, config_path: str = "config/policies.yaml", strict_mode: bool = False):
+    # Validations kept per user
+    _HISTORY_SIZE = 100
+
+    # Window for rate limiting (seconds)
+    _RATE_WINDOW_SECONDS = 60
+
+    # (status, requires_confirmation) for risk levels with a fixed outcome:
+    # CRITICAL risk -> Block, HIGH risk -> Require confirmation
+    _STATUS_BY_LEVEL = {
+        RiskLevel.CRITICAL: (ValidationStatus.BLOCKED, False),
+        RiskLevel.HIGH: (ValidationStatus.REQUIRES_CONFIRMATION, True),
+    }
+
+    # Number of (tool, parameters) screening results memoized
+    _SCREEN_CACHE_SIZE = 4096
+
+    # rate_limits.actions_per_minute policy key for each risk level
+    _RATE_LIMIT_KEYS = {level: f"{level.name.lower()}_risk" for level in RiskLevel}
+
+    # Parameter keys checked by _check_parameters
+    _URL_KEYS = frozenset(["url", "link", "website"])
+    _PATH_KEYS = frozenset(["path", "file_path", "directory"])
+    _APP_KEYS = frozenset(["app_name", "application"])
+    _PARAM_KEY_KINDS = {
+        **dict.fromkeys(_URL_KEYS, "url"),
+        **dict.fromkeys(_PATH_KEYS, "path"),
+        **dict.fromkeys(_APP_KEYS, "app"),
+    }
+
+    def __init__(
+        self,
+        config_path: str = "config/policies.yaml",
+        strict_mode: bool = False,
+        batch_concurrency: int = 4,
+    ):
         """Initialize safety validator.
 
         Args:
             config_path: Path to policies configuration
             strict_mode: If True, block instead of warn on sanitization issues
+            batch_concurrency: Worker threads used by validate_batch (1 disables)
         """
-        self.risk_scorer = RiskScorer(config_path)
-        self.sanitizer = InputSanitizer(config_path)
-        self.allow_list = AllowListManager(config_path)
+        self.config_path = config_path
         self.strict_mode = strict_mode
 
-        # Validation history for rate limiting
-        self.validation_history: Dict[str, List[ValidationResult]] = {}
+        # Validation history for rate limiting (last 100 per user)
+        self.validation_history: Dict[str, Deque[ValidationResult]] = {}
+        self._history_tallies: Dict[str, _HistoryTallies] = {}
+        self._user_locks: Dict[str, threading.Lock] = {}
+
+        # LRU of history-independent screening results keyed by
+        # (tool, parameters digest); screening is deterministic per config
+        self._screen_cache: "OrderedDict[Tuple[str, bytes], Any]" = OrderedDict()
+        self._screen_cache_lock = threading.Lock()
+
+        # Components and lookup tables derived from the policy file
+        self.reload_policies()
+
+        # Thread pool for validate_batch, created on first use
+        self.batch_concurrency = batch_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def close(self):
+        """Shut down the validate_batch thread pool."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __enter__(self) -> "SafetyValidator":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def reload_policies(self):
+        """Load the policy file and rebuild everything derived from it.
+
+        Call after editing the policy file; validation history is kept, and
+        cached screening results are discarded.
+        """
+        self.risk_scorer, self.sanitizer, self.allow_list = _shared_components(self.config_path)
+
+        # Prebuilt results for explicitly blocked tools
+        self._blocked_results = {
+            tool: self._blocked_tool_result(tool) for tool in self.allow_list.blocked_tools
+        }
+
+        # Schema checks for tools whose parameters can skip full screening
+        self._fast_screens = self._build_fast_screens()
+
+        # Screening results for parameterless calls to allowed tools, the most
+        # common call shape; decided once here instead of hashed per call
+        self._parameterless_screens = {
+            tool: self._screen_uncached(tool, {}) for tool in self.allow_list.allowed_tools
+        }
+
+        # Per-minute action limit for each risk level
+        rate_limits = self.allow_list.get_policy("rate_limits.actions_per_minute", {}) or {}
+        self._rate_limit_by_level = {
+            level: rate_limits.get(key, 30) for level, key in self._RATE_LIMIT_KEYS.items()
+        }
+
+        with self._screen_cache_lock:
+            self._screen_cache.clear()
 
     def validate(
         self,
@@ -93,23 +332,174 @@ class SafetyValidator:
         Returns:
             ValidationResult with status and details
         """
+        screened = self._screen(tool, parameters)
+        if isinstance(screened, ValidationResult):
+            return screened
+
+        return self._finalize(user_id, tool, screened, context)
+
+    def _screen(
+        self, tool: str, parameters: Dict[str, Any]
+    ) -> Union[ValidationResult, Tuple[Dict[str, Any], List[str]]]:
+        """Screen a tool call, reusing the cached result for repeated inputs.
+
+        Safe to call concurrently.
+
+        Args:
+            tool: Tool name to execute
+            parameters: Tool parameters
+
+        Returns:
+            Final BLOCKED ValidationResult, or (sanitized_params, warnings)
+        """
+        # Explicitly blocked tools: skip hashing and screening entirely
+        blocked = self._blocked_results.get(tool)
+        if blocked is not None:
+            return replace(blocked, sanitized_parameters={}, warnings=[], timestamp=None)
+
+        # Schema-declared tools: parameters the schema accepts would pass
+        # screening unchanged and without warnings
+        fast_screen = self._fast_screens.get(tool)
+        if fast_screen is not None and fast_screen(parameters):
+            return dict(parameters), []
+
+        cached = None if parameters else self._parameterless_screens.get(tool)
+        if cached is None:
+            cached = self._screen_cached(tool, parameters)
+            if cached is None:
+                return self._screen_uncached(tool, parameters)
+
+        # Hand out copies so callers cannot mutate the cached entry
+        if isinstance(cached, ValidationResult):
+            return replace(cached, warnings=list(cached.warnings), timestamp=None)
+        sanitized_params, warnings = cached
+        return copy.deepcopy(sanitized_params), list(warnings)
+
+    def _screen_cached(
+        self, tool: str, parameters: Dict[str, Any]
+    ) -> Optional[Union[ValidationResult, Tuple[Dict[str, Any], List[str]]]]:
+        """Look up or compute the shared screening result in the LRU cache.
+
+        Args:
+            tool: Tool name to execute
+            parameters: Tool parameters
+
+        Returns:
+            Cached entry (callers must copy it), or None if parameters cannot be keyed
+        """
+        key = self._screen_key(tool, parameters)
+        if key is None:
+            return None
+
+        with self._screen_cache_lock:
+            cached = self._screen_cache.get(key)
+            if cached is not None:
+                self._screen_cache.move_to_end(key)
+
+        if cached is None:
+            cached = self._screen_uncached(tool, parameters)
+            with self._screen_cache_lock:
+                self._screen_cache[key] = cached
+                if len(self._screen_cache) > self._SCREEN_CACHE_SIZE:
+                    self._screen_cache.popitem(last=False)
+
+        return cached
+
+    def _build_fast_screens(self) -> Dict[str, FastScreen]:
+        """Compile the fast-path checks declared under tool_schemas.
+
+        Returns:
+            Tool name -> parameter check, for allowed tools with valid schemas
+        """
+        screened_keys = self.sanitizer.SCREENED_KEYS | self._PARAM_KEY_KINDS.keys()
+        fast_screens = {}
+
+        for tool, fields in (self.allow_list.get_policy("tool_schemas", {}) or {}).items():
+            if not self.allow_list.is_tool_allowed(tool):
+                continue
+            try:
+                fast_screens[tool] = compile_tool_schema(
+                    fields, self.sanitizer.detect_pii, screened_keys
+                )
+            except (AttributeError, TypeError, ValueError, re.error) as e:
+                print(f"Warning: Ignoring schema for {tool}: {e}")
+
+        return fast_screens
+
+    @staticmethod
+    def _screen_key(tool: str, parameters: Dict[str, Any]) -> Optional[Tuple[str, bytes]]:
+        """Build the screening cache key for a tool call.
+
+        Args:
+            tool: Tool name
+            parameters: Tool parameters
+
+        Returns:
+            (tool, parameters digest), or None if parameters cannot be keyed
+        """
+        canonical = None
+        # Tuples and non-finite floats take the freeze() fallback so they
+        # cannot share a key (and a cached sanitized result) with lists or None
+        if orjson is not None and _orjson_keyable(parameters):
+            try:
+                canonical = orjson.dumps(parameters, option=_ORJSON_KEY_OPTIONS)
+            except TypeError:  # Non-string keys or non-JSON values
+                pass
+
+        if canonical is None:
+            # Other leaves (custom objects, NaN) may share a repr; don't cache
+            if not _repr_keyable(parameters):
+                return None
+            try:
+                canonical = b"r" + repr(freeze(parameters)).encode()
+            except TypeError:
+                return None
+
+        return tool, hashlib.blake2b(canonical, digest_size=16).digest()
+
+    @staticmethod
+    def _blocked_tool_result(tool: str) -> ValidationResult:
+        """Build the result for an explicitly blocked tool.
+
+        Args:
+            tool: Tool name
+
+        Returns:
+            BLOCKED ValidationResult
+        """
+        return ValidationResult(
+            status=ValidationStatus.BLOCKED,
+            risk_score=RiskScore(
+                level=RiskLevel.CRITICAL,
+                score=1.0,
+                factors={"tool_blocked": 1.0},
+                reasoning=f"Tool '{tool}' is explicitly blocked",
+            ),
+            sanitized_parameters={},
+            warnings=[],
+            blocked_reason=f"Tool '{tool}' is on the blocked list",
+        )
+
+    def _screen_uncached(
+        self, tool: str, parameters: Dict[str, Any]
+    ) -> Union[ValidationResult, Tuple[Dict[str, Any], List[str]]]:
+        """Run the validation steps that do not depend on user history.
+
+        Safe to call concurrently.
+
+        Args:
+            tool: Tool name to execute
+            parameters: Tool parameters
+
+        Returns:
+            Final BLOCKED ValidationResult, or (sanitized_params, warnings)
+        """
         warnings = []
 
         # Step 1: Check if tool is on allow list
         if not self.allow_list.is_tool_allowed(tool):
             if self.allow_list.is_tool_blocked(tool):
-                return ValidationResult(
-                    status=ValidationStatus.BLOCKED,
-                    risk_score=RiskScore(
-                        level=RiskLevel.CRITICAL,
-                        score=1.0,
-                        factors={"tool_blocked": 1.0},
-                        reasoning=f"Tool '{tool}' is explicitly blocked",
-                    ),
-                    sanitized_parameters={},
-                    warnings=[],
-                    blocked_reason=f"Tool '{tool}' is on the blocked list",
-                )
+                return self._blocked_tool_result(tool)
             else:
                 warnings.append(f"Tool '{tool}' not on allow list")
                 if self.strict_mode:
@@ -146,47 +536,79 @@ class SafetyValidator:
                 blocked_reason=f"Sanitization failed: {e}",
             )
 
-        # Step 3: Validate specific parameter types
-        param_validation_warnings = self._validate_parameter_types(sanitized_params)
-        warnings.extend(param_validation_warnings)
+        # Step 3: Validate specific parameter types and check for PII
+        warnings.extend(self._check_parameters(sanitized_params))
+
+        return sanitized_params, warnings
+
+    def _finalize(
+        self,
+        user_id: str,
+        tool: str,
+        screened: Tuple[Dict[str, Any], List[str]],
+        context: Optional[Dict[str, Any]],
+    ) -> ValidationResult:
+        """Run the history-dependent validation steps for a screened call.
 
-        # Step 4: Calculate risk score
-        enriched_context = self._enrich_context(user_id, context or {})
-        risk_score = self.risk_scorer.calculate_risk(tool, sanitized_params, enriched_context)
+        Args:
+            user_id: User identifier
+            tool: Tool name to execute
+            screened: (sanitized_params, warnings) from _screen
+            context: Optional execution context
 
-        # Step 5: Check for PII in parameters
-        pii_warnings = self._check_pii(sanitized_params)
-        warnings.extend(pii_warnings)
+        Returns:
+            ValidationResult with status and details
+        """
+        sanitized_params, warnings = screened
 
-        # Step 6: Check rate limits
-        rate_limit_exceeded, rate_msg = self._check_rate_limits(user_id, risk_score.level)
-        if rate_limit_exceeded:
-            return ValidationResult(
-                status=ValidationStatus.BLOCKED,
+        with self._user_lock(user_id):
+            # Step 4: Calculate risk score
+            enriched_context = self._enrich_context(user_id, context or {})
+            risk_score = self.risk_scorer.calculate_risk(tool, sanitized_params, enriched_context)
+
+            # Step 5: Check rate limits
+            rate_limit_exceeded, rate_msg = self._check_rate_limits(user_id, risk_score.level)
+            if rate_limit_exceeded:
+                return ValidationResult(
+                    status=ValidationStatus.BLOCKED,
+                    risk_score=risk_score,
+                    sanitized_parameters=sanitized_params,
+                    warnings=warnings,
+                    blocked_reason=rate_msg,
+                )
+
+            # Step 6: Determine final status based on risk level
+            status, requires_confirmation, confirmation_msg = self._determine_status(
+                tool, risk_score, warnings
+            )
+
+            result = ValidationResult(
+                status=status,
                 risk_score=risk_score,
                 sanitized_parameters=sanitized_params,
                 warnings=warnings,
-                blocked_reason=rate_msg,
+                requires_confirmation=requires_confirmation,
+                confirmation_message=confirmation_msg,
             )
 
-        # Step 7: Determine final status based on risk level
-        status, requires_confirmation, confirmation_msg = self._determine_status(
-            tool, risk_score, warnings
-        )
+            # Record validation for rate limiting
+            self._record_validation(user_id, result)
 
-        result = ValidationResult(
-            status=status,
-            risk_score=risk_score,
-            sanitized_parameters=sanitized_params,
-            warnings=warnings,
-            requires_confirmation=requires_confirmation,
-            confirmation_message=confirmation_msg,
-        )
+        return result
 
-        # Record validation for rate limiting
-        self._record_validation(user_id, result)
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        """Get the lock guarding a user's validation history.
 
-        return result
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Per-user lock, so different users never contend
+        """
+        lock = self._user_locks.get(user_id)
+        if lock is None:
+            lock = self._user_locks.setdefault(user_id, threading.Lock())
+        return lock
 
     def validate_batch(
         self,
@@ -196,6 +618,87 @@ class SafetyValidator:
     ) -> List[ValidationResult]:
         """Validate multiple tool calls in a batch.
 
+        The history-independent steps (allow list, sanitization, parameter
+        and PII checks) run concurrently; risk scoring, rate limiting and
+        recording then run in submission order, so results match validating
+        the calls one by one.
+
+        Args:
+            user_id: User identifier
+            tool_calls: List of tool calls with 'tool' and 'parameters'
+            context: Optional execution context
+
+        Returns:
+            List of ValidationResult objects
+        """
+        if len(tool_calls) <= 1 or self.batch_concurrency <= 1:
+            return self._validate_sequential(user_id, tool_calls, context)
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self._screen, tool_call.get("tool"), tool_call.get("parameters", {}))
+            for tool_call in tool_calls
+        ]
+
+        results = []
+
+        for index, future in enumerate(futures):
+            screened = future.result()
+            if isinstance(screened, ValidationResult):
+                result = screened
+            else:
+                result = self._finalize(user_id, tool_calls[index].get("tool"), screened, context)
+            results.append(result)
+
+            # If any high-risk action is blocked, stop validation
+            if (
+                result.status == ValidationStatus.BLOCKED
+                and result.risk_score.level == RiskLevel.CRITICAL
+            ):
+                for pending in futures[index + 1 :]:
+                    pending.cancel()
+                break
+
+        return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the validate_batch thread pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.batch_concurrency, thread_name_prefix="safety-validator"
+                )
+            return self._executor
+
+    async def validate_batch_async(
+        self,
+        user_id: str,
+        tool_calls: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[ValidationResult]:
+        """Validate multiple tool calls without blocking the event loop.
+
+        Runs validate_batch in a worker thread, so screening still fans out
+        over the batch thread pool and results are identical.
+
+        Args:
+            user_id: User identifier
+            tool_calls: List of tool calls with 'tool' and 'parameters'
+            context: Optional execution context
+
+        Returns:
+            List of ValidationResult objects
+        """
+        return await asyncio.to_thread(self.validate_batch, user_id, tool_calls, context)
+
+    def _validate_sequential(
+        self,
+        user_id: str,
+        tool_calls: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[ValidationResult]:
+        """Validate tool calls one by one, stopping at the first CRITICAL block.
+
         Args:
             user_id: User identifier
             tool_calls: List of tool calls with 'tool' and 'parameters'
@@ -222,37 +725,74 @@ class SafetyValidator:
 
         return results
 
-    def _validate_parameter_types(self, parameters: Dict[str, Any]) -> List[str]:
-        """Validate specific parameter types.
+    @staticmethod
+    def _inspect_parameters(parameters: Dict[str, Any]) -> Iterator[Tuple[str, Any, str, str]]:
+        """Walk parameters once, descending into nested dicts.
+
+        Args:
+            parameters: Sanitized parameters
+
+        Yields:
+            (parent_prefix, key, lowercase_key, value) for every string value;
+            the dotted path is prefix + key, joined only when a warning needs it
+        """
+        stack = [("", iter(parameters.items()))]
+
+        while stack:
+            prefix, items = stack[-1]
+            for key, value in items:
+                if isinstance(value, str):
+                    yield prefix, key, str(key).lower(), value
+                elif isinstance(value, dict):
+                    # Descend now; the parent iterator resumes afterwards
+                    stack.append((f"{prefix}{key}.", iter(value.items())))
+                    break
+            else:
+                stack.pop()
+
+    def _check_parameters(self, parameters: Dict[str, Any]) -> List[str]:
+        """Validate specific parameter types, then check all strings for PII.
 
         Args:
             parameters: Sanitized parameters
 
         Returns:
-            List of warnings
+            List of warnings (parameter type warnings first, then PII)
         """
-        warnings = []
+        type_warnings = []
+        pii_warnings = []
+        key_kinds = self._PARAM_KEY_KINDS
+        strings = list(self._inspect_parameters(parameters))
 
-        for key, value in parameters.items():
-            if not isinstance(value, str):
-                continue
+        for prefix, key, key_lower, value in strings:
+            kind = key_kinds.get(key_lower)
 
             # Validate URLs
-            if key.lower() in ["url", "link", "website"]:
+            if kind == "url":
                 if not self.allow_list.validate_url(value):
-                    warnings.append(f"URL validation failed for: {value[:50]}")
+                    type_warnings.append(f"URL validation failed for: {value[:50]}")
 
             # Validate file paths
-            elif key.lower() in ["path", "file_path", "directory"]:
+            elif kind == "path":
                 if not self.allow_list.validate_file_path(value):
-                    warnings.append(f"File path validation failed for: {value[:50]}")
+                    type_warnings.append(f"File path validation failed for: {value[:50]}")
 
             # Validate application names
-            elif key.lower() in ["app_name", "application"]:
+            elif kind == "app":
                 if not self.allow_list.is_application_allowed(value):
-                    warnings.append(f"Application '{value}' not on allow list")
+                    type_warnings.append(f"Application '{value}' not on allow list")
+
+        # Check for PII, screening every string value in one scan
+        pii_results = self.sanitizer.detect_pii_batch([value for *_, value in strings])
+        for (prefix, key, _, _), pii_found in zip(strings, pii_results):
+            if pii_found:
+                pii_types = [pii_type for pii_type, _ in pii_found]
+                pii_warnings.append(
+                    f"PII detected in parameter '{prefix}{key}': {', '.join(pii_types)}"
+                )
 
-        return warnings
+        type_warnings.extend(pii_warnings)
+        return type_warnings
 
     def _enrich_context(self, user_id: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Enrich context with validation history.
@@ -266,42 +806,17 @@ class SafetyValidator:
         """
         enriched = context.copy()
 
-        # Add validation history
-        history = self.validation_history.get(user_id, [])
+        # Add validation history counters
+        tallies = self._history_tallies.get(user_id)
 
-        # Count recent failed validations
-        recent_failed = sum(1 for v in history[-10:] if v.status == ValidationStatus.BLOCKED)
-        enriched["failed_validations"] = recent_failed
+        # Count recent failed validations (last 10)
+        enriched["failed_validations"] = tallies.blocked_last_10 if tallies else 0
 
-        # Count recent high-risk actions
-        recent_high_risk = sum(
-            1 for v in history[-20:] if v.risk_score.level in [RiskLevel.HIGH, RiskLevel.CRITICAL]
-        )
-        enriched["recent_high_risk_count"] = recent_high_risk
+        # Count recent high-risk actions (last 20)
+        enriched["recent_high_risk_count"] = tallies.high_risk_last_20 if tallies else 0
 
         return enriched
 
-    def _check_pii(self, parameters: Dict[str, Any]) -> List[str]:
-        """Check for PII in parameters.
-
-        Args:
-            parameters: Parameters to check
-
-        Returns:
-            List of warnings
-        """
-        warnings = []
-
-        for key, value in parameters.items():
-            if isinstance(value, str):
-                pii_found = self.sanitizer.detect_pii(value)
-
-                if pii_found:
-                    pii_types = [pii_type for pii_type, _ in pii_found]
-                    warnings.append(f"PII detected in parameter '{key}': {', '.join(pii_types)}")
-
-        return warnings
-
     def _check_rate_limits(self, user_id: str, risk_level: RiskLevel) -> tuple[bool, Optional[str]]:
         """Check if user has exceeded rate limits.
 
@@ -312,23 +827,16 @@ class SafetyValidator:
         Returns:
             Tuple of (exceeded, message)
         """
-        history = self.validation_history.get(user_id, [])
-
-        # Get rate limits from policies
-        rate_limits = self.allow_list.get_policy("rate_limits.actions_per_minute", {})
-
         # Check recent actions (last minute)
-        cutoff_time = datetime.utcnow()
-        recent_actions = [v for v in history if (cutoff_time - v.timestamp).total_seconds() < 60]
+        recent_actions = self._count_recent_actions(user_id, time.monotonic())
 
         # Get limit for this risk level
-        limit_key = f"{risk_level.value.lower()}_risk"
-        limit = rate_limits.get(limit_key, 30)
+        limit = self._rate_limit_by_level[risk_level]
 
-        if len(recent_actions) >= limit:
+        if recent_actions >= limit:
             return (
                 True,
-                f"Rate limit exceeded: {len(recent_actions)} actions in last minute (limit: {limit})",
+                f"Rate limit exceeded: {recent_actions} actions in last minute (limit: {limit})",
             )
 
         return False, None
@@ -346,23 +854,20 @@ class SafetyValidator:
         Returns:
             Tuple of (status, requires_confirmation, confirmation_message)
         """
-        # CRITICAL risk -> Block
-        if risk_score.level == RiskLevel.CRITICAL:
-            return ValidationStatus.BLOCKED, False, None
+        entry = self._STATUS_BY_LEVEL.get(risk_score.level)
 
-        # HIGH risk -> Require confirmation
-        elif risk_score.level == RiskLevel.HIGH:
-            msg = self._generate_confirmation_message(tool, risk_score)
-            return ValidationStatus.REQUIRES_CONFIRMATION, True, msg
-
-        # MEDIUM/LOW risk with warnings -> Sanitized
-        elif warnings:
-            return ValidationStatus.SANITIZED, False, None
-
-        # LOW risk, no issues -> Approved
-        else:
+        # MEDIUM/LOW risk: Sanitized if there are warnings, else Approved
+        if entry is None:
+            if warnings:
+                return ValidationStatus.SANITIZED, False, None
             return ValidationStatus.APPROVED, False, None
 
+        # HIGH/CRITICAL risk: the confirmation message is only built when needed
+        status, requires_confirmation = entry
+        if requires_confirmation:
+            return status, True, self._generate_confirmation_message(tool, risk_score)
+        return status, False, None
+
     def _generate_confirmation_message(self, tool: str, risk_score: RiskScore) -> str:
         """Generate confirmation message for high-risk actions.
 
@@ -374,7 +879,7 @@ class SafetyValidator:
             Confirmation message
         """
         return (
-            f"This action '{tool}' is classified as {risk_score.level.value} risk. "
+            f"This action '{tool}' is classified as {risk_score.level.name} risk. "
             f"Do you want to proceed?\n\n"
             f"Risk assessment:\n{risk_score.reasoning}"
         )
@@ -386,14 +891,60 @@ class SafetyValidator:
             user_id: User identifier
             result: Validation result
         """
-        if user_id not in self.validation_history:
-            self.validation_history[user_id] = []
+        history = self.validation_history.get(user_id)
+        if history is None:
+            history = deque(maxlen=self._HISTORY_SIZE)
+            self.validation_history[user_id] = history
+            # The rate window is not capped at the history size so limits
+            # above it still apply; rate-limited calls are not recorded, so
+            # it never holds more than the largest per-minute limit
+            tallies = _HistoryTallies()
+            self._history_tallies[user_id] = tallies
+        else:
+            tallies = self._history_tallies[user_id]
+
+        # Retire entries that slide out of the counting windows
+        size = len(history)
+        if size >= 10 and history[-10].status == ValidationStatus.BLOCKED:
+            tallies.blocked_last_10 -= 1
+        if size >= 20 and history[-20].risk_score.level >= RiskLevel.HIGH:
+            tallies.high_risk_last_20 -= 1
+        if size == self._HISTORY_SIZE:
+            evicted = history[0]
+            tallies.status_counts[evicted.status] -= 1
+            tallies.risk_score_sum -= evicted.risk_score.score
+
+        # Keep only last 100 validations per user (deque evicts the oldest)
+        history.append(result)
+
+        if result.status == ValidationStatus.BLOCKED:
+            tallies.blocked_last_10 += 1
+        if result.risk_score.level >= RiskLevel.HIGH:
+            tallies.high_risk_last_20 += 1
+        tallies.status_counts[result.status] = tallies.status_counts.get(result.status, 0) + 1
+        tallies.risk_score_sum += result.risk_score.score
+        tallies.recent_timestamps.append(time.monotonic())
+
+    def _count_recent_actions(self, user_id: str, now: float) -> int:
+        """Count a user's recorded actions within the rate-limit window.
+
+        Args:
+            user_id: User identifier
+            now: Current time.monotonic() value
+
+        Returns:
+            Number of actions in the last minute
+        """
+        tallies = self._history_tallies.get(user_id)
+        if tallies is None:
+            return 0
 
-        self.validation_history[user_id].append(result)
+        # Timestamps are appended in order, so expired ones are at the head
+        window = tallies.recent_timestamps
+        while window and now - window[0] >= self._RATE_WINDOW_SECONDS:
+            window.popleft()
 
-        # Keep only last 100 validations per user
-        if len(self.validation_history[user_id]) > 100:
-            self.validation_history[user_id] = self.validation_history[user_id][-100:]
+        return len(window)
 
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         """Get validation statistics for a user.
@@ -404,27 +955,22 @@ class SafetyValidator:
         Returns:
             Dictionary of statistics
         """
-        history = self.validation_history.get(user_id, [])
-
-        if not history:
-            return {
-                "total_validations": 0,
-                "approved": 0,
-                "blocked": 0,
-                "requires_confirmation": 0,
-                "average_risk_score": 0.0,
-            }
+        # Read every counter under the lock so the snapshot is consistent
+        # with concurrent recording; no pass over the history is needed
+        with self._user_lock(user_id):
+            history = self.validation_history.get(user_id)
+            tallies = self._history_tallies.get(user_id)
+            total = len(history) if history else 0
+            counts = dict(tallies.status_counts) if tallies else {}
+            risk_score_sum = tallies.risk_score_sum if tallies else 0.0
+            recent_actions = self._count_recent_actions(user_id, time.monotonic())
 
         return {
-            "total_validations": len(history),
-            "approved": sum(1 for v in history if v.status == ValidationStatus.APPROVED),
-            "blocked": sum(1 for v in history if v.status == ValidationStatus.BLOCKED),
-            "requires_confirmation": sum(
-                1 for v in history if v.status == ValidationStatus.REQUIRES_CONFIRMATION
-            ),
-            "sanitized": sum(1 for v in history if v.status == ValidationStatus.SANITIZED),
-            "average_risk_score": sum(v.risk_score.score for v in history) / len(history),
-            "recent_actions": len(
-                [v for v in history if (datetime.utcnow() - v.timestamp).total_seconds() < 60]
-            ),
+            "total_validations": total,
+            "approved": counts.get(ValidationStatus.APPROVED, 0),
+            "blocked": counts.get(ValidationStatus.BLOCKED, 0),
+            "requires_confirmation": counts.get(ValidationStatus.REQUIRES_CONFIRMATION, 0),
+            "sanitized": counts.get(ValidationStatus.SANITIZED, 0),
+            "average_risk_score": risk_score_sum / total if total else 0.0,
+            "recent_actions": recent_actions,
         }
@@ -159,6 +159,20 @@ class TestAdversarialInputs:
         # Should sanitize event handlers
         assert "onerror" not in result.sanitized_parameters.get("content", "")
 
+    def test_xss_nested_payload_is_rejected_quickly(self, validator):
+        """Test deeply nested XSS fragments are blocked without quadratic rescans."""
+        import time
+
+        start = time.monotonic()
+        result = validator.validate(
+            user_id="test_user",
+            tool="NOTE_TAKING",
+            parameters={"content": "java" * 4000 + "script:" * 4000},
+        )
+
+        assert result.status == ValidationStatus.BLOCKED
+        assert time.monotonic() - start < 1.0
+
     # URL Injection Tests
 
     def test_url_localhost(self, validator):
@@ -5,6 +5,27 @@ from app.validator import SafetyValidator, ValidationStatus
 from app.risk_scorer import RiskScorer, RiskLevel
 from app.sanitizers import InputSanitizer, SanitizationError
 from app.allow_lists import AllowListManager
+from app.policy_loader import load_policies
+
+
+class TestPolicyLoader:
+    """Test policy file loading."""
+
+    def test_sidecar_cache(self, tmp_path):
+        """Test parsed policies are cached and invalidated on change."""
+        config = tmp_path / "policies.yaml"
+        config.write_text("allowed_tools:\n  - GET_TIME\n")
+
+        assert load_policies(config) == {"allowed_tools": ["GET_TIME"]}
+        assert (tmp_path / "policies.yaml.json").exists()
+        assert load_policies(config) == {"allowed_tools": ["GET_TIME"]}
+
+        config.write_text("allowed_tools:\n  - GET_DATE\n  - GET_TIME\n")
+        assert load_policies(config) == {"allowed_tools": ["GET_DATE", "GET_TIME"]}
+
+    def test_missing_file(self, tmp_path):
+        """Test missing policy file yields empty policies."""
+        assert load_policies(tmp_path / "missing.yaml") == {}
 
 
 class TestAllowListManager:
@@ -47,6 +68,18 @@ class TestAllowListManager:
         assert not allow_list.validate_file_path("../../etc/passwd")
         assert not allow_list.validate_file_path("/etc/shadow")
 
+    def test_blocklist_contains_matches_find(self, monkeypatch):
+        """Test TokenScanner.contains agrees with find with and without pyahocorasick."""
+        import app.sanitizers as sanitizers
+
+        tokens = [("..", ".."), ("/etc/", "/etc/"), ("LOCALHOST", "localhost")]
+        texts = ["", "/home/a.txt", "../x", "/etc/shadow", "http://localhost", "a/etc"]
+        for module in (sanitizers.ahocorasick, None):
+            monkeypatch.setattr(sanitizers, "ahocorasick", module)
+            scanner = sanitizers.TokenScanner(tokens)
+            for text in texts:
+                assert scanner.contains(text) == (scanner.find(text) is not None)
+
 
 class TestRiskScorer:
     """Test risk scoring."""
@@ -86,6 +119,13 @@ class TestRiskScorer:
 
         assert risk2.score > risk1.score
 
+    def test_parameter_risk_is_case_insensitive(self, scorer):
+        """Test parameter patterns match regardless of case."""
+        lower = scorer.calculate_risk("DATABASE_QUERY", {"query": "drop table users"})
+        upper = scorer.calculate_risk("DATABASE_QUERY", {"query": "DROP TABLE users"})
+
+        assert upper.factors["parameters"] == lower.factors["parameters"] > 0
+
     def test_requires_confirmation(self, scorer):
         """Test confirmation requirement."""
         risk_low = scorer.calculate_risk("GET_TIME", {})
@@ -94,6 +134,33 @@ class TestRiskScorer:
         assert not scorer.requires_confirmation(risk_low)
         assert scorer.requires_confirmation(risk_high) or risk_high.level == RiskLevel.MEDIUM
 
+    def test_calculate_risk_is_memoized(self, scorer):
+        """Test repeated identical calls reuse the cached score."""
+        risk1 = scorer.calculate_risk("SET_TIMER", {"duration": 5, "tags": ["a", {"b": 1}]})
+        risk2 = scorer.calculate_risk("SET_TIMER", {"tags": ["a", {"b": 1}], "duration": 5})
+
+        assert risk1 is risk2
+        with pytest.raises(TypeError):
+            risk1.factors["tool_type"] = 0.0
+
+        # Context the scorer never reads does not defeat the cache
+        risk3 = scorer.calculate_risk("GET_TIME", {}, {"hour": 3, "session": "a"})
+        risk4 = scorer.calculate_risk("GET_TIME", {}, {"session": "b", "hour": 3})
+        assert risk3 is risk4
+        assert risk3.factors["context"] > 0
+
+    def test_calculate_risks_batch(self, scorer):
+        """Test batch scoring matches individual scoring."""
+        calls = [
+            ("GET_WEATHER", {"location": "Paris"}, None),
+            ("SYSTEM_SHUTDOWN", {}, {"hour": 3}),
+        ]
+
+        risks = scorer.calculate_risks(calls)
+
+        assert [r.level for r in risks] == [RiskLevel.LOW, RiskLevel.CRITICAL]
+        assert risks[1].score == scorer.calculate_risk("SYSTEM_SHUTDOWN", {}, {"hour": 3}).score
+
 
 class TestInputSanitizer:
     """Test input sanitization."""
@@ -138,6 +205,24 @@ class TestInputSanitizer:
 
         assert "<script>" not in sanitized["content"]
 
+    def test_sanitize_unicode_lookalikes(self, sanitizer):
+        """Test full-width and zero-width characters are normalized before scanning."""
+        params = {"content": "＜script＞alert(1)＜/script＞hi"}
+        sanitized, warnings = sanitizer.sanitize_parameters("NOTE_TAKING", params)
+
+        assert sanitized["content"] == "hi"
+
+        with pytest.raises(SanitizationError):
+            sanitizer.sanitize_parameters("DATABASE_QUERY", {"query": "DROP\u200b TABLE users"})
+
+    def test_sanitize_batch(self, sanitizer):
+        """Test batch sanitization."""
+        results = sanitizer.sanitize_batch(
+            [("NOTE_TAKING", {"content": "<script>x</script>hi"}), ("GET_TIME", {})]
+        )
+
+        assert results == [({"content": "hi"}, []), ({}, [])]
+
     def test_detect_pii(self, sanitizer):
         """Test PII detection."""
         text = "My card is 4532-1234-5678-9010 and SSN is 123-45-6789"
@@ -148,6 +233,37 @@ class TestInputSanitizer:
         assert "credit_card" in pii_types
         assert "ssn" in pii_types
 
+    def test_detect_pii_non_ascii_digits(self, sanitizer):
+        """Test PII written with non-ASCII digits is detected like the `re` patterns."""
+        text = "SSN: \uff11\uff12\uff13-\uff14\uff15-\uff16\uff17\uff18\uff19"
+
+        assert [p[0] for p in sanitizer.detect_pii(text)] == ["ssn"]
+
+    def test_detect_pii_batch(self, sanitizer):
+        """Test batch detection matches per-text detection."""
+        texts = ["hello", "SSN is 123-45-6789", "1234", "5678-9012-3456", "a@example.com"]
+
+        assert sanitizer.detect_pii_batch(texts) == [sanitizer.detect_pii(t) for t in texts]
+
+    def test_email_scanner_matches_regex(self):
+        """Test the linear email scanner agrees with re and handles adversarial input."""
+        import random
+        import re
+        import time
+        from app.pii_scanners import EMAIL_PATTERN, LINEAR_PATTERNS
+
+        regex = re.compile(EMAIL_PATTERN)
+        linear = LINEAR_PATTERNS[EMAIL_PATTERN]()
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = "".join(rng.choice("ab1._-@|é ") for _ in range(rng.randint(0, 30)))
+            assert linear.findall(text) == regex.findall(text)
+            assert linear.sub("[EMAIL]", text) == regex.sub("[EMAIL]", text)
+
+        start = time.perf_counter()
+        assert linear.findall("a." * 20000 + "@") == []
+        assert time.perf_counter() - start < 1.0
+
     def test_mask_pii(self, sanitizer):
         """Test PII masking."""
         text = "My card is 4532-1234-5678-9010"
@@ -215,6 +331,201 @@ class TestSafetyValidator:
         assert len(results) == 2
         assert all(r.is_safe() or r.needs_confirmation() for r in results)
 
+    def test_repeated_validation_uses_isolated_copies(self, validator):
+        """Test cached screening results are not shared between calls."""
+        params = {"note": {"text": "hello"}}
+        first = validator.validate("test_user", "NOTE_TAKING", params)
+        first.sanitized_parameters["note"]["text"] = "tampered"
+
+        second = validator.validate("test_user", "NOTE_TAKING", params)
+
+        assert second.sanitized_parameters == {"note": {"text": "hello"}}
+        assert second.status == first.status
+
+    def test_screen_key_canonicalization(self):
+        """Test cache keys ignore dict order but not key types."""
+        key = SafetyValidator._screen_key
+
+        assert key("T", {"a": 1, "b": [1, 2]}) == key("T", {"b": [1, 2], "a": 1})
+        assert key("T", {1: "x"}) != key("T", {"1": "x"})
+        assert key("T", {"a": 1}) != key("T", {"a": "1"})
+        assert key("T", {"a": [1]}) != key("T", {"a": (1,)})
+
+    def test_screen_key_fallback_distinguishes_containers(self, monkeypatch):
+        """Test the freeze() fallback keys lists and tuples apart."""
+        import app.validator as validator_module
+
+        monkeypatch.setattr(validator_module, "orjson", None)
+        key = SafetyValidator._screen_key
+
+        assert key("T", {"a": [1]}) != key("T", {"a": (1,)})
+        assert key("T", {"a": {1}}) != key("T", {"a": frozenset({1})})
+
+    def test_screen_key_fallback_requires_value_reprs(self):
+        """Test the freeze() fallback only keys leaves whose repr is their value."""
+        from datetime import datetime
+        from decimal import Decimal
+
+        class Opaque:
+            def __repr__(self):
+                return "Opaque"
+
+        key = SafetyValidator._screen_key
+
+        assert key("T", {"a": Opaque()}) is None
+        assert key("T", {"a": (Opaque(),)}) is None
+        assert key("T", {"a": float("nan")}) is None
+        assert key("T", {"a": Decimal("1.5")}) != key("T", {"a": Decimal("2.5")})
+        assert key("T", {"a": datetime(2024, 1, 1)}) is not None
+
+    def test_tuple_screen_is_not_reused_for_list(self, validator):
+        """Test a cached tuple screen cannot stand in for the list form."""
+        payload = "<script>alert(1)</script>hi"
+        validator.validate("test_user", "NOTE_TAKING", {"text": (payload,)})
+
+        result = validator.validate("test_user", "NOTE_TAKING", {"text": [payload]})
+        fresh = SafetyValidator().validate("test_user", "NOTE_TAKING", {"text": [payload]})
+
+        assert result.sanitized_parameters == fresh.sanitized_parameters == {"text": ["hi"]}
+
+    def test_non_finite_screen_is_not_reused_for_none(self, validator):
+        """Test NaN and infinities are not served the cached None screen."""
+        validator.validate("test_user", "SET_ALARM", {"x": None})
+
+        for value in (float("nan"), float("inf"), float("-inf")):
+            result = validator.validate("test_user", "SET_ALARM", {"x": value})
+            fresh = SafetyValidator().validate("test_user", "SET_ALARM", {"x": value})
+
+            assert result.status == fresh.status == ValidationStatus.BLOCKED
+            assert result.sanitized_parameters == fresh.sanitized_parameters
+
+    def test_schema_fast_path_matches_full_screening(self, validator):
+        """Test schema-declared tools get the same results as full screening."""
+        full = SafetyValidator()
+        full._fast_screens = {}
+        calls = [
+            ("SET_TIMER", {"duration": 300}),
+            ("SET_TIMER", {"duration": 999999999999999999}),
+            ("GET_WEATHER", {"location": "Paris"}),
+            ("GET_WEATHER", {"location": "<script>x</script>Paris"}),
+            ("GET_TIME", {}),
+        ]
+
+        assert validator._fast_screens["SET_TIMER"]({"duration": 300})
+        assert not validator._fast_screens["SET_TIMER"]({"duration": True})
+        for tool, params in calls:
+            fast = validator.validate("schema_user", tool, params)
+            slow = full.validate("schema_user", tool, params)
+            assert (fast.status, fast.sanitized_parameters, fast.warnings) == (
+                slow.status,
+                slow.sanitized_parameters,
+                slow.warnings,
+            )
+
+    def test_parameterless_calls_use_precomputed_screens(self, validator):
+        """Test parameterless calls skip the screening cache with identical results."""
+        result = validator.validate("shape_user", "GET_WEATHER", {})
+        expected = validator._screen_uncached("GET_WEATHER", {})
+
+        assert (result.sanitized_parameters, result.warnings) == expected
+        assert "GET_WEATHER" in validator._parameterless_screens
+        assert not validator._screen_cache
+
+    def test_validate_batch_concurrent_matches_sequential(self):
+        """Test concurrent batch validation matches one-by-one validation."""
+        tool_calls = [
+            {"tool": "GET_WEATHER", "parameters": {"location": "Paris"}},
+            {"tool": "SEND_EMAIL", "parameters": {"to": "test@example.com"}},
+            {"tool": "SYSTEM_SHUTDOWN", "parameters": {}},
+            {"tool": "GET_TIME", "parameters": {}},
+        ]
+
+        concurrent = SafetyValidator(batch_concurrency=4).validate_batch("u", tool_calls)
+        sequential = SafetyValidator(batch_concurrency=1).validate_batch("u", tool_calls)
+
+        assert len(concurrent) == 3  # Stops at the CRITICAL block
+        assert [r.status for r in concurrent] == [r.status for r in sequential]
+        assert [r.warnings for r in concurrent] == [r.warnings for r in sequential]
+
+    def test_validate_batch_concurrent_first_use_shares_pool(self):
+        """Test concurrent first batches share one thread pool, released by close()."""
+        import threading
+
+        tool_calls = [{"tool": "GET_TIME", "parameters": {}}] * 2
+        barrier = threading.Barrier(8)
+        executors = []
+
+        with SafetyValidator(batch_concurrency=2) as validator:
+
+            def run():
+                barrier.wait()
+                validator.validate_batch("u", tool_calls)
+                executors.append(validator._executor)
+
+            threads = [threading.Thread(target=run) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert len({id(executor) for executor in executors}) == 1
+
+        assert validator._executor is None
+        assert executors[0]._shutdown
+
+    def test_validate_batch_async(self, validator):
+        """Test async batch validation matches the sync batch."""
+        import asyncio
+
+        tool_calls = [
+            {"tool": "GET_WEATHER", "parameters": {"location": "Paris"}},
+            {"tool": "OPEN_APPLICATION", "parameters": {"app_name": "chrome"}},
+        ]
+
+        results = asyncio.run(validator.validate_batch_async("async_user", tool_calls))
+        expected = SafetyValidator().validate_batch("async_user", tool_calls)
+
+        assert [r.status for r in results] == [r.status for r in expected]
+
+    def test_validation_result_has_no_instance_dict(self, validator):
+        """Test retained results use slots rather than a per-instance dict."""
+        result = validator.validate("test_user", "GET_TIME", {})
+
+        assert not hasattr(result, "__dict__")
+        assert not hasattr(result.risk_score, "__dict__")
+
+    def test_rate_limit_above_history_size(self, tmp_path):
+        """Test per-minute limits larger than the retained history still apply."""
+        config = tmp_path / "policies.yaml"
+        config.write_text(
+            "allowed_tools: [GET_TIME]\n"
+            "risk_levels:\n  low: [GET_TIME]\n"
+            "rate_limits:\n  actions_per_minute:\n    low_risk: 150\n"
+        )
+        validator = SafetyValidator(config_path=str(config))
+
+        results = [validator.validate("busy_user", "GET_TIME", {}) for _ in range(151)]
+
+        assert all(r.is_safe() for r in results[:150])
+        assert results[150].status == ValidationStatus.BLOCKED
+
+    def test_reload_policies(self, tmp_path):
+        """Test reloading picks up an edited policy file."""
+        config = tmp_path / "policies.yaml"
+        config.write_text("allowed_tools: [GET_TIME, GET_DATE]\n")
+        validator = SafetyValidator(config_path=str(config))
+        assert validator.validate("reload_user", "GET_DATE", {}).is_safe()
+
+        config.write_text(
+            "allowed_tools: [GET_TIME]\n"
+            "blocked_tools: [GET_DATE]\n"
+            "rate_limits:\n  actions_per_minute:\n    medium_risk: 1\n"
+        )
+        validator.reload_policies()
+
+        assert validator.validate("reload_user", "GET_DATE", {}).status == ValidationStatus.BLOCKED
+        assert validator.validate("reload_user", "GET_TIME", {}).status == ValidationStatus.BLOCKED
+
     def test_user_stats(self, validator):
         """Test user statistics."""
         # Execute some validations
@@ -1,6 +1,7 @@
 """Verification script for Module 6 setup."""
 
 from pathlib import Path
+import os
 import sys
 
 
@@ -21,10 +22,19 @@ def check_files():
         "pyproject.toml",
     ]
 
+    # List each directory once instead of stat-ing every file
+    present = {}
+    for parent in {Path(file).parent for file in files}:
+        try:
+            with os.scandir(parent) as entries:
+                present[parent] = {entry.name for entry in entries}
+        except OSError:
+            present[parent] = set()
+
     all_exist = True
     for file in files:
         path = Path(file)
-        if path.exists():
+        if path.name in present[path.parent]:
             print(f"✓ {file}")
         else:
             print(f"✗ {file} - NOT FOUND")
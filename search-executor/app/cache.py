@@ -1,22 +1,145 @@
 """Redis cache for search results with TTL support."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import json
 import hashlib
+import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from dataclasses import asdict
+from dataclasses import asdict, fields, is_dataclass
+from functools import lru_cache
 import redis.asyncio as aioredis
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used instead
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _key_digest(query: str, filter_parts: Tuple[str, ...]) -> bytes:
+    """Digest a query and its sorted filters; repeated lookups skip the work.
+
+    Filters arrive already formatted, so values that compare equal but format
+    differently (True, 1, 1.0) are not conflated by the memoization.
+
+    Args:
+        query: Search query
+        filter_parts: "key:value" strings in sorted key order
+
+    Returns:
+        Raw 16-byte digest used as the cache key suffix
+    """
+    # Normalized query followed by sorted filters
+    key_string = query.lower().strip()
+    if filter_parts:
+        key_string += "|" + "|".join(filter_parts)
+
+    return hashlib.blake2b(key_string.encode(), digest_size=16).digest()
+
+
+def _dumps(entry: Dict[str, Any]) -> bytes:
+    """Serialize a cache entry straight to bytes.
+
+    Args:
+        entry: Cache entry
+
+    Returns:
+        JSON-encoded entry
+    """
+    if orjson is not None:
+        return orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(entry).encode()
+
+
+def _loads(data: bytes) -> Dict[str, Any]:
+    """Deserialize a cache entry read from Redis."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Field names of a dataclass type, looked up once per class."""
+    return tuple(field.name for field in fields(cls))
+
+
+def _dataclass_to_dict(result: Any) -> Dict[str, Any]:
+    """Convert a dataclass without to_dict() to a dictionary.
+
+    Flat fields are read directly instead of going through asdict(), which
+    recursively deep-copies every value; only nested dataclasses use it.
+
+    Args:
+        result: Dataclass instance
+
+    Returns:
+        Field name -> value dictionary
+    """
+    data = {}
+    for name in _field_names(type(result)):
+        value = getattr(result, name)
+        data[name] = asdict(value) if is_dataclass(value) else value
+    return data
+
+
+def _serialize_results(results: List[Any]) -> List[Dict[str, Any]]:
+    """Convert search results to plain dictionaries.
+
+    Args:
+        results: SearchResult/ParsedContent objects, dataclasses or dicts
+
+    Returns:
+        List of dictionaries
+    """
+    serialized = []
+    append = serialized.append
+
+    for result in results:
+        if isinstance(result, dict):
+            append(result)
+        elif hasattr(result, "to_dict"):
+            append(result.to_dict())
+        elif is_dataclass(result):
+            append(_dataclass_to_dict(result))
+        else:
+            append(dict(vars(result)))
+
+    return serialized
+
+
+def _results_digest(serialized: List[Dict[str, Any]]) -> str:
+    """Digest of serialized results, ignoring when each result was fetched.
+
+    Args:
+        serialized: Results as returned by _serialize_results
+
+    Returns:
+        Hex digest that changes only when the result content changes
+    """
+    content = [
+        {key: value for key, value in result.items() if key != "timestamp"}
+        for result in serialized
+    ]
+    return hashlib.blake2b(_dumps(content), digest_size=16).hexdigest()
+
 
 class SearchCache:
     """Redis-based cache for search results."""
 
+    # Keys requested per SCAN round trip and unlinked per UNLINK call
+    _SCAN_BATCH = 500
+
     def __init__(
         self,
         redis_url: str = "redis://localhost:6379/0",
         ttl_seconds: int = 86400,  # 24 hours
         key_prefix: str = "search:",
         max_cache_size_mb: int = 100,
+        l1_size: int = 1024,
+        l1_ttl_seconds: int = 60,
     ):
         """Initialize search cache.
 
@@ -25,15 +148,25 @@ class SearchCache:
             ttl_seconds: Cache TTL in seconds
             key_prefix: Prefix for cache keys
             max_cache_size_mb: Max cache size in MB
+            l1_size: Entries kept in the in-process cache in front of Redis (0 disables)
+            l1_ttl_seconds: Max age of in-process entries; bounds how long
+                changes made by other processes can go unnoticed
         """
         self.redis_url = redis_url
         self.ttl_seconds = ttl_seconds
         self.key_prefix = key_prefix
+        self._prefix_bytes = key_prefix.encode()
         self.max_cache_size_mb = max_cache_size_mb
 
         # Redis client (lazy initialization)
         self._redis: Optional[aioredis.Redis] = None
 
+        # In-process LRU of cache_key -> (monotonic expiry, serialized entry);
+        # hot queries skip the Redis round trip
+        self._l1: "OrderedDict[bytes, Tuple[float, bytes]]" = OrderedDict()
+        self._l1_size = l1_size
+        self._l1_ttl = min(l1_ttl_seconds, ttl_seconds)
+
         # Statistics
         self.stats = {
             "hits": 0,
@@ -46,8 +179,10 @@ class SearchCache:
     async def _get_redis(self) -> aioredis.Redis:
         """Get or initialize Redis connection."""
         if self._redis is None:
+            # Values stay bytes so they feed the JSON decoder without a
+            # bytes -> str round trip
             self._redis = await aioredis.from_url(
-                self.redis_url, encoding="utf-8", decode_responses=True
+                self.redis_url, encoding="utf-8", decode_responses=False
             )
         return self._redis
 
@@ -61,24 +196,42 @@ class SearchCache:
         Returns:
             Cached results or None if not found
         """
+        entry = await self.get_entry(query, **filters)
+        if entry is None:
+            return None
+        return entry.get("results", [])
+
+    async def get_entry(self, query: str, **filters) -> Optional[Dict[str, Any]]:
+        """Get the full cache entry, including cached_at and the results hash.
+
+        Args:
+            query: Search query
+            **filters: Additional search filters
+
+        Returns:
+            Cache entry or None if not found
+        """
         try:
-            redis = await self._get_redis()
             cache_key = self._generate_key(query, filters)
 
-            # Get from cache
-            cached_data = await redis.get(cache_key)
+            # Get from the in-process cache, then Redis
+            cached_data = self._l1_get(cache_key)
+            if cached_data is None:
+                redis = await self._get_redis()
+                cached_data = await redis.get(cache_key)
+                if cached_data:
+                    self._l1_put(cache_key, cached_data)
 
             if cached_data:
                 self.stats["hits"] += 1
-                data = json.loads(cached_data)
-                return data.get("results", [])
+                return _loads(cached_data)
 
             self.stats["misses"] += 1
             return None
 
         except Exception as e:
             self.stats["errors"] += 1
-            print(f"Cache get error: {e}")
+            logger.warning("Cache get error: %s", e)
             return None
 
     async def set(self, query: str, results: List[Any], **filters) -> bool:
@@ -89,6 +242,67 @@ class SearchCache:
             results: Search results to cache
             **filters: Additional search filters
 
+        Returns:
+            True if cached successfully
+        """
+        prepared = self._prepare(results)
+        if prepared is None:
+            return False
+        return await self._store(query, filters, *prepared)
+
+    async def set_if_changed(
+        self, query: str, results: List[Any], previous_hash: Optional[str], **filters
+    ) -> bool:
+        """Cache search results unless they match the cached entry's content.
+
+        Args:
+            query: Search query
+            results: Freshly fetched search results
+            previous_hash: "hash" of the cached entry being revalidated
+            **filters: Additional search filters
+
+        Returns:
+            True if the results changed and were cached
+        """
+        prepared = self._prepare(results)
+        if prepared is None or prepared[1] == previous_hash:
+            return False
+        return await self._store(query, filters, *prepared)
+
+    def _prepare(
+        self, results: List[Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+        """Serialize results and hash them for storage.
+
+        Args:
+            results: Search results to cache
+
+        Returns:
+            (serialized results, results hash), or None if they cannot be serialized
+        """
+        try:
+            serialized = _serialize_results(results)
+            return serialized, _results_digest(serialized)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning("Cache set error: %s", e)
+            return None
+
+    async def _store(
+        self,
+        query: str,
+        filters: Dict[str, Any],
+        serialized: List[Dict[str, Any]],
+        digest: str,
+    ) -> bool:
+        """Write a cache entry for serialized results.
+
+        Args:
+            query: Search query
+            filters: Search filters
+            serialized: Results as returned by _serialize_results
+            digest: Results hash stored alongside them
+
         Returns:
             True if cached successfully
         """
@@ -96,34 +310,27 @@ class SearchCache:
             redis = await self._get_redis()
             cache_key = self._generate_key(query, filters)
 
-            # Convert results to dictionaries
-            serializable_results = []
-            for result in results:
-                if hasattr(result, "to_dict"):
-                    serializable_results.append(result.to_dict())
-                elif isinstance(result, dict):
-                    serializable_results.append(result)
-                else:
-                    serializable_results.append(asdict(result))
-
             # Create cache entry
             cache_entry = {
                 "query": query,
                 "filters": filters,
-                "results": serializable_results,
+                "results": serialized,
+                "hash": digest,
                 "cached_at": datetime.utcnow().isoformat(),
                 "ttl": self.ttl_seconds,
             }
 
             # Store in Redis with TTL
-            await redis.setex(cache_key, self.ttl_seconds, json.dumps(cache_entry))
+            payload = _dumps(cache_entry)
+            await redis.setex(cache_key, self.ttl_seconds, payload)
+            self._l1_put(cache_key, payload)
 
             self.stats["writes"] += 1
             return True
 
         except Exception as e:
             self.stats["errors"] += 1
-            print(f"Cache set error: {e}")
+            logger.warning("Cache set error: %s", e)
             return False
 
     async def delete(self, query: str, **filters) -> bool:
@@ -140,12 +347,13 @@ class SearchCache:
             redis = await self._get_redis()
             cache_key = self._generate_key(query, filters)
 
+            self._l1.pop(cache_key, None)
             deleted = await redis.delete(cache_key)
             return deleted > 0
 
         except Exception as e:
             self.stats["errors"] += 1
-            print(f"Cache delete error: {e}")
+            logger.warning("Cache delete error: %s", e)
             return False
 
     async def clear(self, pattern: Optional[str] = None) -> int:
@@ -160,6 +368,9 @@ class SearchCache:
         try:
             redis = await self._get_redis()
 
+            # Keys are hashed, so pattern clears drop the whole in-process cache
+            self._l1.clear()
+
             if pattern:
                 # Match specific pattern
                 search_pattern = f"{self.key_prefix}{pattern}"
@@ -167,22 +378,27 @@ class SearchCache:
                 # Match all search keys
                 search_pattern = f"{self.key_prefix}*"
 
-            # Find matching keys
-            keys = []
-            async for key in redis.scan_iter(match=search_pattern):
-                keys.append(key)
+            # Unlink matching keys in batches as the scan streams them, so
+            # memory stays bounded and Redis frees values off its main thread
+            deleted = 0
+            batch = []
+            async for key in redis.scan_iter(
+                match=search_pattern, count=self._SCAN_BATCH
+            ):
+                batch.append(key)
+                if len(batch) >= self._SCAN_BATCH:
+                    deleted += await redis.unlink(*batch)
+                    batch.clear()
 
-            # Delete keys
-            if keys:
-                deleted = await redis.delete(*keys)
-                self.stats["evictions"] += deleted
-                return deleted
+            if batch:
+                deleted += await redis.unlink(*batch)
 
-            return 0
+            self.stats["evictions"] += deleted
+            return deleted
 
         except Exception as e:
             self.stats["errors"] += 1
-            print(f"Cache clear error: {e}")
+            logger.warning("Cache clear error: %s", e)
             return 0
 
     async def get_info(self) -> Dict[str, Any]:
@@ -199,7 +415,9 @@ class SearchCache:
 
             # Count cache keys
             key_count = 0
-            async for _ in redis.scan_iter(match=f"{self.key_prefix}*"):
+            async for _ in redis.scan_iter(
+                match=f"{self.key_prefix}*", count=self._SCAN_BATCH
+            ):
                 key_count += 1
 
             return {
@@ -214,7 +432,43 @@ class SearchCache:
             self.stats["errors"] += 1
             return {"error": str(e)}
 
-    def _generate_key(self, query: str, filters: Dict[str, Any]) -> str:
+    def _l1_get(self, cache_key: bytes) -> Optional[bytes]:
+        """Get a serialized entry from the in-process cache.
+
+        Args:
+            cache_key: Cache key
+
+        Returns:
+            Serialized entry, or None if missing or expired
+        """
+        entry = self._l1.get(cache_key)
+        if entry is None:
+            return None
+
+        expires_at, data = entry
+        if time.monotonic() >= expires_at:
+            del self._l1[cache_key]
+            return None
+
+        self._l1.move_to_end(cache_key)
+        return data
+
+    def _l1_put(self, cache_key: bytes, data: bytes):
+        """Store a serialized entry in the in-process cache.
+
+        Args:
+            cache_key: Cache key
+            data: Serialized entry
+        """
+        if self._l1_size <= 0:
+            return
+
+        self._l1[cache_key] = (time.monotonic() + self._l1_ttl, data)
+        self._l1.move_to_end(cache_key)
+        if len(self._l1) > self._l1_size:
+            self._l1.popitem(last=False)
+
+    def _generate_key(self, query: str, filters: Dict[str, Any]) -> bytes:
         """Generate cache key from query and filters.
 
         Args:
@@ -222,20 +476,13 @@ class SearchCache:
             filters: Search filters
 
         Returns:
-            Cache key string
+            Prefixed cache key bytes
         """
-        # Create key components
-        components = [query.lower().strip()]
+        filter_parts = tuple(f"{key}:{filters[key]}" for key in sorted(filters))
+        digest = _key_digest(query, filter_parts)
 
-        # Add sorted filters
-        for key in sorted(filters.keys()):
-            components.append(f"{key}:{filters[key]}")
-
-        # Hash the combined key
-        key_string = "|".join(components)
-        key_hash = hashlib.md5(key_string.encode()).hexdigest()
-
-        return f"{self.key_prefix}{key_hash}"
+        # Binary key: Redis takes it as-is, with no per-call formatting or encoding
+        return self._prefix_bytes + digest
 
     async def close(self):
         """Close Redis connection."""
@@ -264,27 +511,23 @@ class MockSearchCache(SearchCache):
     def __init__(self, **kwargs):
         """Initialize mock cache."""
         super().__init__(redis_url="redis://mock", **kwargs)
-        self._cache: Dict[str, Any] = {}
+        self._cache: Dict[bytes, Any] = {}
 
     async def _get_redis(self):
         """Return None (mock)."""
         return None
 
-    async def get(self, query: str, **filters) -> Optional[List[Dict[str, Any]]]:
+    async def get_entry(self, query: str, **filters) -> Optional[Dict[str, Any]]:
         """Get from in-memory cache."""
         try:
             cache_key = self._generate_key(query, filters)
 
-            if cache_key in self._cache:
-                entry = self._cache[cache_key]
-
+            entry = self._cache.get(cache_key)
+            if entry is not None:
                 # Check TTL
-                cached_at = datetime.fromisoformat(entry["cached_at"])
-                age_seconds = (datetime.utcnow() - cached_at).total_seconds()
-
-                if age_seconds < self.ttl_seconds:
+                if time.monotonic() < entry["expires_at"]:
                     self.stats["hits"] += 1
-                    return entry["results"]
+                    return entry
                 else:
                     # Expired
                     del self._cache[cache_key]
@@ -296,26 +539,24 @@ class MockSearchCache(SearchCache):
             self.stats["errors"] += 1
             return None
 
-    async def set(self, query: str, results: List[Any], **filters) -> bool:
+    async def _store(
+        self,
+        query: str,
+        filters: Dict[str, Any],
+        serialized: List[Dict[str, Any]],
+        digest: str,
+    ) -> bool:
         """Store in in-memory cache."""
         try:
             cache_key = self._generate_key(query, filters)
 
-            # Convert results
-            serializable_results = []
-            for result in results:
-                if hasattr(result, "to_dict"):
-                    serializable_results.append(result.to_dict())
-                elif isinstance(result, dict):
-                    serializable_results.append(result)
-                else:
-                    serializable_results.append(asdict(result))
-
             self._cache[cache_key] = {
                 "query": query,
                 "filters": filters,
-                "results": serializable_results,
+                "results": serialized,
+                "hash": digest,
                 "cached_at": datetime.utcnow().isoformat(),
+                "expires_at": time.monotonic() + self.ttl_seconds,
             }
 
             self.stats["writes"] += 1
@@ -1,15 +1,54 @@
 """Content fetcher for extracting full page content from URLs."""
 
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 import httpx
 from bs4 import BeautifulSoup
+import soupsieve
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlsplit
 
+try:
+    import lxml  # noqa: F401  # enables BeautifulSoup's C-backed "lxml" tree builder
 
-@dataclass
+    _HTML_PARSER = "lxml"
+except ImportError:  # lxml is optional; the pure-Python parser is used instead
+    _HTML_PARSER = "html.parser"
+
+# Whitespace cleanup applied to every extracted page
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+_SPACES_RE = re.compile(r" +")
+
+# Common content containers, most specific first; compiled once rather
+# than parsed from the selector string on every page
+_CONTENT_SELECTORS = tuple(
+    soupsieve.compile(selector)
+    for selector in ("main", "article", "#content", ".content", ".post-content")
+)
+
+# Elements whose text is never page content
+_JUNK_TAGS = [
+    "script",
+    "style",
+    "nav",
+    "footer",
+    "header",
+    "noscript",
+    "aside",
+    "iframe",
+]
+
+_HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
+# ("name" | "property", attribute value) -> <meta> content
+_MetaIndex = Dict[Tuple[str, str], Any]
+
+
+@dataclass(slots=True)
 class FetchedContent:
     """Fetched and extracted web page content."""
 
@@ -71,6 +110,7 @@ class ContentFetcher:
         follow_redirects: bool = True,
         extract_images: bool = False,
         extract_links: bool = False,
+        keep_html: bool = False,
     ):
         """Initialize content fetcher.
 
@@ -81,12 +121,14 @@ class ContentFetcher:
             follow_redirects: Follow HTTP redirects
             extract_images: Extract image URLs
             extract_links: Extract link URLs
+            keep_html: Keep raw HTML (pages under 100 KB) in html_content
         """
         self.timeout = timeout
         self.max_content_length = max_content_length
         self.follow_redirects = follow_redirects
         self.extract_images = extract_images
         self.extract_links = extract_links
+        self.keep_html = keep_html
 
         # Default user agent
         self.user_agent = user_agent or (
@@ -95,6 +137,15 @@ class ContentFetcher:
             "Chrome/91.0.4472.124 Safari/537.36"
         )
 
+        # HTTP clients (lazy initialization), reused so keep-alive connections
+        # and TLS sessions carry over between fetches; one per event loop,
+        # since pooled connections cannot outlive the loop that opened them
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+        # Thread pool for HTML parsing, created on first use, so parsing one
+        # page does not stall the event loop for other fetches
+        self._parse_pool: Optional[ThreadPoolExecutor] = None
+
         # Statistics
         self.stats = {
             "total_fetches": 0,
@@ -103,6 +154,57 @@ class ContentFetcher:
             "bytes_downloaded": 0,
         }
 
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get or initialize the HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            await self._drop_stale_clients()
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=self.follow_redirects,
+                headers={"User-Agent": self.user_agent},
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def _drop_stale_clients(self):
+        """Release clients whose event loop has been closed."""
+        for loop in [loop for loop in self._clients if loop.is_closed()]:
+            client = self._clients.pop(loop)
+            try:
+                await client.aclose()
+            except Exception:
+                # Its transports went with the closed loop; dropping the
+                # client lets the sockets be collected
+                pass
+
+    def _get_parse_pool(self) -> ThreadPoolExecutor:
+        """Get or initialize the HTML parsing thread pool."""
+        if self._parse_pool is None:
+            self._parse_pool = ThreadPoolExecutor(
+                max_workers=os.cpu_count(), thread_name_prefix="content-parser"
+            )
+        return self._parse_pool
+
+    async def close(self):
+        """Close the HTTP client of the running loop and the parsing thread pool."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        await self._drop_stale_clients()
+
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False)
+            self._parse_pool = None
+
+    async def __aenter__(self) -> "ContentFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
     async def fetch(self, url: str) -> FetchedContent:
         """Fetch and extract content from URL.
 
@@ -122,34 +224,82 @@ class ContentFetcher:
             raise ValueError(f"Invalid URL: {url}")
 
         # Fetch content
-        async with httpx.AsyncClient(
-            timeout=self.timeout,
-            follow_redirects=self.follow_redirects,
-            headers={"User-Agent": self.user_agent},
-        ) as client:
-            try:
-                response = await client.get(url)
+        client = await self._get_client()
+        try:
+            async with client.stream("GET", url) as response:
                 response.raise_for_status()
+                body = await self._read_capped(response)
+                html = body.decode(response.encoding or "utf-8", errors="replace")
+
+            content_length = len(body)
+            self.stats["bytes_downloaded"] += content_length
+            self.stats["successful_fetches"] += 1
+
+            # Parse content off the event loop
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_parse_pool(),
+                self._parse_content,
+                url,
+                str(response.url),
+                response.status_code,
+                html,
+            )
+
+        except Exception as e:
+            self.stats["failed_fetches"] += 1
+            raise
+
+    async def _read_capped(self, response: httpx.Response) -> bytes:
+        """Read a streamed response body, stopping once it exceeds the size cap.
 
-                # Check content length
-                content_length = len(response.content)
-                if content_length > self.max_content_length:
-                    raise ValueError(f"Content too large: {content_length} bytes")
+        Args:
+            response: Streaming response
 
-                self.stats["bytes_downloaded"] += content_length
-                self.stats["successful_fetches"] += 1
+        Returns:
+            Response body
 
-                # Parse content
-                return self._parse_content(
-                    url=url,
-                    final_url=str(response.url),
-                    status_code=response.status_code,
-                    html=response.text,
+        Raises:
+            ValueError: If the declared or received size exceeds max_content_length
+        """
+        # Reject up front when the server declares an oversized body
+        declared = response.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > self.max_content_length:
+            raise ValueError(f"Content too large: {declared} bytes")
+
+        body = bytearray()
+        async for chunk in response.aiter_bytes(chunk_size=65536):
+            body += chunk
+            if len(body) > self.max_content_length:
+                raise ValueError(
+                    f"Content too large: over {self.max_content_length} bytes"
                 )
 
-            except Exception as e:
-                self.stats["failed_fetches"] += 1
-                raise
+        return bytes(body)
+
+    async def fetch_many(
+        self, urls: List[str], concurrency: int = 20
+    ) -> Dict[str, Union[FetchedContent, Exception]]:
+        """Fetch several URLs concurrently.
+
+        Args:
+            urls: URLs to fetch; duplicates are fetched once
+            concurrency: Max fetches in flight at a time
+
+        Returns:
+            URL -> FetchedContent, or the exception its fetch raised
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(url: str) -> Union[FetchedContent, Exception]:
+            async with semaphore:
+                try:
+                    return await self.fetch(url)
+                except Exception as e:
+                    return e
+
+        unique_urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(fetch_one(url) for url in unique_urls))
+        return dict(zip(unique_urls, results))
 
     def _parse_content(
         self,
@@ -169,16 +319,17 @@ class ContentFetcher:
         Returns:
             FetchedContent object
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, _HTML_PARSER)
 
         # Extract title
-        title = self._extract_title(soup)
+        metas = self._index_meta_tags(soup)
+        title = self._extract_title(soup, metas)
 
         # Extract metadata
-        meta_description = self._extract_meta_description(soup)
-        meta_keywords = self._extract_meta_keywords(soup)
-        author = self._extract_author(soup)
-        publish_date = self._extract_publish_date(soup)
+        meta_description = self._extract_meta_description(metas)
+        meta_keywords = self._extract_meta_keywords(metas)
+        author = self._extract_author(soup, metas)
+        publish_date = self._extract_publish_date(soup, metas)
 
         # Extract main content
         text_content = self._extract_text_content(soup)
@@ -206,7 +357,7 @@ class ContentFetcher:
             status_code=status_code,
             title=title,
             text_content=text_content,
-            html_content=html if len(html) < 100_000 else None,
+            html_content=html if self.keep_html and len(html) < 100_000 else None,
             meta_description=meta_description,
             meta_keywords=meta_keywords,
             author=author,
@@ -218,16 +369,39 @@ class ContentFetcher:
             read_time_minutes=read_time_minutes,
         )
 
-    def _extract_title(self, soup: BeautifulSoup) -> str:
+    def _index_meta_tags(self, soup: BeautifulSoup) -> _MetaIndex:
+        """Index <meta> tag contents in a single pass over the document.
+
+        Keys are ("name", value) and ("property", value); the first tag per
+        key wins, as with soup.find.
+
+        Args:
+            soup: Parsed document
+
+        Returns:
+            Mapping of key to the tag's content attribute (may be None)
+        """
+        metas: _MetaIndex = {}
+
+        for tag in soup.find_all("meta"):
+            content = tag.get("content")
+            for attr in ("name", "property"):
+                value = tag.get(attr)
+                if value is not None:
+                    metas.setdefault((attr, value), content)
+
+        return metas
+
+    def _extract_title(self, soup: BeautifulSoup, metas: _MetaIndex) -> str:
         """Extract page title."""
         # Try <title> tag
         if soup.title and soup.title.string:
             return soup.title.string.strip()
 
         # Try Open Graph title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            return og_title["content"].strip()
+        og_title = metas.get(("property", "og:title"))
+        if og_title:
+            return og_title.strip()
 
         # Try first h1
         h1 = soup.find("h1")
@@ -236,50 +410,51 @@ class ContentFetcher:
 
         return "Untitled"
 
-    def _extract_meta_description(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_meta_description(self, metas: _MetaIndex) -> Optional[str]:
         """Extract meta description."""
         # Standard meta description
-        meta = soup.find("meta", attrs={"name": "description"})
-        if meta and meta.get("content"):
-            return meta["content"].strip()
+        description = metas.get(("name", "description"))
+        if description:
+            return description.strip()
 
         # Open Graph description
-        og_desc = soup.find("meta", property="og:description")
-        if og_desc and og_desc.get("content"):
-            return og_desc["content"].strip()
+        og_desc = metas.get(("property", "og:description"))
+        if og_desc:
+            return og_desc.strip()
 
         return None
 
-    def _extract_meta_keywords(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_meta_keywords(self, metas: _MetaIndex) -> List[str]:
         """Extract meta keywords."""
-        meta = soup.find("meta", attrs={"name": "keywords"})
-        if meta and meta.get("content"):
-            keywords = meta["content"].split(",")
-            return [k.strip() for k in keywords if k.strip()]
+        keywords = metas.get(("name", "keywords"))
+        if keywords:
+            return [k.strip() for k in keywords.split(",") if k.strip()]
 
         return []
 
-    def _extract_author(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_author(self, soup: BeautifulSoup, metas: _MetaIndex) -> Optional[str]:
         """Extract author."""
         # Meta author tag
-        meta = soup.find("meta", attrs={"name": "author"})
-        if meta and meta.get("content"):
-            return meta["content"].strip()
+        author = metas.get(("name", "author"))
+        if author:
+            return author.strip()
 
         # Schema.org author
-        author = soup.find("span", itemprop="author")
-        if author:
-            return author.get_text().strip()
+        author_tag = soup.find("span", itemprop="author")
+        if author_tag:
+            return author_tag.get_text().strip()
 
         return None
 
-    def _extract_publish_date(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_publish_date(
+        self, soup: BeautifulSoup, metas: _MetaIndex
+    ) -> Optional[str]:
         """Extract publish date."""
         # Meta tags
         for prop in ["article:published_time", "datePublished", "publishDate"]:
-            meta = soup.find("meta", property=prop)
-            if meta and meta.get("content"):
-                return meta["content"].strip()
+            published = metas.get(("property", prop))
+            if published:
+                return published.strip()
 
         # Time tag
         time_tag = soup.find("time")
@@ -290,16 +465,17 @@ class ContentFetcher:
 
     def _extract_text_content(self, soup: BeautifulSoup) -> str:
         """Extract main text content."""
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
+        # Remove scripts, styles and page chrome; one find_all walk, which
+        # measures faster than a soupsieve select() of the same tags
+        for junk in soup.find_all(_JUNK_TAGS):
+            junk.decompose()
 
         # Try to find main content area
         main_content = None
 
         # Common content containers
-        for selector in ["main", "article", "#content", ".content", ".post-content"]:
-            main_content = soup.select_one(selector)
+        for selector in _CONTENT_SELECTORS:
+            main_content = selector.select_one(soup)
             if main_content:
                 break
 
@@ -314,8 +490,8 @@ class ContentFetcher:
         text = main_content.get_text(separator="\n", strip=True)
 
         # Clean up whitespace
-        text = re.sub(r"\n\s*\n+", "\n\n", text)
-        text = re.sub(r" +", " ", text)
+        text = _BLANK_LINES_RE.sub("\n\n", text)
+        text = _SPACES_RE.sub(" ", text)
 
         return text.strip()
 
@@ -323,10 +499,13 @@ class ContentFetcher:
         """Extract all headings."""
         headings = []
 
-        for tag in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-            text = tag.get_text().strip()
-            if text:
-                headings.append(text)
+        # One walk with a set lookup per node; find_all's per-node name
+        # matcher and soupsieve's select() are both slower for this
+        for tag in soup.descendants:
+            if tag.name in _HEADING_TAGS:
+                text = tag.get_text().strip()
+                if text:
+                    headings.append(text)
 
         return headings
 
@@ -334,34 +513,52 @@ class ContentFetcher:
         """Extract image URLs."""
         images = []
 
-        for img in soup.find_all("img"):
+        # Walk lazily so large pages stop at the limit
+        for img in soup.descendants:
+            if img.name != "img":
+                continue
             src = img.get("src") or img.get("data-src")
             if src:
                 # Make absolute URL
                 absolute_url = urljoin(base_url, src)
                 images.append(absolute_url)
+                if len(images) >= 50:  # Limit to 50 images
+                    break
 
-        return images[:50]  # Limit to 50 images
+        return images
 
     def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract link URLs."""
         links = []
+        seen = set()
 
-        for a in soup.find_all("a", href=True):
+        # Walk lazily so large pages stop at the limit
+        for a in soup.descendants:
+            if a.name != "a" or a.get("href") is None:
+                continue
             href = a["href"]
             # Make absolute URL
             absolute_url = urljoin(base_url, href)
 
-            # Filter out anchors and javascript
-            if not absolute_url.startswith(("javascript:", "#", "mailto:")):
-                links.append(absolute_url)
+            # Filter out anchors, javascript and duplicates
+            if (
+                absolute_url.startswith(("javascript:", "#", "mailto:"))
+                or absolute_url in seen
+            ):
+                continue
+
+            seen.add(absolute_url)
+            links.append(absolute_url)
+            if len(links) >= 100:  # Limit to 100 unique links
+                break
 
-        return list(set(links))[:100]  # Limit to 100 unique links
+        return links
 
     def _is_valid_url(self, url: str) -> bool:
         """Check if URL is valid."""
         try:
-            result = urlparse(url)
+            # urlsplit memoizes its results; urlparse does not
+            result = urlsplit(url)
             return all([result.scheme, result.netloc])
         except Exception:
             return False
@@ -373,6 +570,13 @@ class ContentFetcher:
     # Synchronous wrapper
     def fetch_sync(self, url: str) -> FetchedContent:
         """Synchronous fetch wrapper."""
-        import asyncio
 
-        return asyncio.run(self.fetch(url))
+        async def fetch_once() -> FetchedContent:
+            # The client's connections belong to this event loop, which
+            # asyncio.run closes afterwards
+            try:
+                return await self.fetch(url)
+            finally:
+                await self.close()
+
+        return asyncio.run(fetch_once())
@@ -1,13 +1,48 @@
 """Result parser for extracting structured data from search results."""
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+import html
+import logging
 import re
-from urllib.parse import urlparse
+import sys
+from urllib.parse import urlsplit
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Patterns used on every result, compiled once
+_WHITESPACE_RE = re.compile(r"\s+")
+_DATE_RES = (
+    re.compile(r"\b(\d{1,2}[\s/-]\w+[\s/-]\d{2,4})\b"),  # 15 Jan 2024
+    re.compile(r"\b(\d{4}-\d{2}-\d{2})\b"),  # 2024-01-15
+)
+
+
+# URL substrings that mark video and image results
+_VIDEO_MARKERS = ("youtube.com", "vimeo.com", "video")
+_IMAGE_MARKERS = ("image", ".jpg", ".png", ".gif")
+
+# Result fields parse_results_batch passes explicitly rather than as metadata
+_BATCH_FIELDS = frozenset({"title", "url", "snippet", "position", "query", "parsed_at"})
+
+
+def _contains_any(text: str, markers: Tuple[str, ...]) -> bool:
+    """Check for any marker substring without a generator per call."""
+    for marker in markers:
+        if marker in text:
+            return True
+    return False
+
+
+@lru_cache(maxsize=256)
+def _query_terms(query: str) -> Tuple[str, ...]:
+    """Lowercased query terms; a batch scores every result against one query."""
+    return tuple(query.lower().split())
+
+
+@dataclass(slots=True)
 class ParsedContent:
     """Parsed and structured search result content."""
 
@@ -34,8 +69,10 @@ class ParsedContent:
         """Extract domain from URL."""
         if not self.domain and self.url:
             try:
-                parsed = urlparse(self.url)
-                self.domain = parsed.netloc
+                # urlsplit memoizes its results; urlparse does not
+                parsed = urlsplit(self.url)
+                # Results from one site share a single domain string
+                self.domain = sys.intern(parsed.netloc)
             except Exception:
                 self.domain = "unknown"
 
@@ -73,7 +110,8 @@ class ResultParser:
         Args:
             extract_metadata: Extract metadata from results
             calculate_relevance: Calculate relevance scores
-            min_snippet_length: Minimum snippet length
+            min_snippet_length: Soft minimum snippet length; shorter snippets
+                are kept as-is rather than padded
             max_snippet_length: Maximum snippet length
         """
         self.extract_metadata = extract_metadata
@@ -106,6 +144,7 @@ class ResultParser:
         snippet: str,
         query: Optional[str] = None,
         position: int = 0,
+        parsed_at: Optional[datetime] = None,
         **kwargs,
     ) -> ParsedContent:
         """Parse a single search result.
@@ -116,6 +155,7 @@ class ResultParser:
             snippet: Result snippet/description
             query: Original search query (for relevance)
             position: Result position in search
+            parsed_at: Parse timestamp; defaults to now
             **kwargs: Additional metadata
 
         Returns:
@@ -148,6 +188,7 @@ class ResultParser:
             content_type=content_type,
             relevance_score=relevance_score,
             metadata=metadata,
+            parsed_at=parsed_at or datetime.utcnow(),
         )
 
         return parsed
@@ -168,6 +209,9 @@ class ResultParser:
         """
         parsed_results = []
 
+        # One timestamp for the whole batch
+        parsed_at = datetime.utcnow()
+
         for idx, result in enumerate(results):
             try:
                 # Extract known parameters
@@ -178,7 +222,7 @@ class ResultParser:
 
                 # Get additional metadata (exclude already extracted)
                 extra_kwargs = {k: v for k, v in result.items()
-                               if k not in ["title", "url", "snippet", "position", "query"]}
+                               if k not in _BATCH_FIELDS}
 
                 parsed = self.parse_result(
                     title=title,
@@ -186,12 +230,13 @@ class ResultParser:
                     snippet=snippet,
                     query=query,
                     position=position,
+                    parsed_at=parsed_at,
                     **extra_kwargs,
                 )
                 parsed_results.append(parsed)
 
             except Exception as e:
-                print(f"Warning: Failed to parse result {idx}: {e}")
+                logger.warning("Failed to parse result %d: %s", idx, e)
                 continue
 
         return parsed_results
@@ -208,11 +253,11 @@ class ResultParser:
         if not text:
             return ""
 
-        # Remove extra whitespace
-        text = re.sub(r"\s+", " ", text)
+        # Decode HTML entities (named and numeric) rather than dropping them
+        text = html.unescape(text)
 
-        # Remove HTML entities
-        text = re.sub(r"&[a-z]+;", "", text)
+        # Remove extra whitespace, including decoded &nbsp;
+        text = _WHITESPACE_RE.sub(" ", text)
 
         # Strip and return
         return text.strip()
@@ -232,10 +277,6 @@ class ResultParser:
         if len(snippet) > self.max_snippet_length:
             snippet = snippet[: self.max_snippet_length - 3] + "..."
 
-        # Ensure minimum length
-        if len(snippet) < self.min_snippet_length:
-            snippet = snippet.ljust(self.min_snippet_length, " ")
-
         return snippet
 
     def _detect_content_type(self, url: str) -> str:
@@ -249,16 +290,18 @@ class ResultParser:
         """
         url_lower = url.lower()
 
-        # Check file extensions
-        for ext, content_type in self.file_extensions.items():
-            if url_lower.endswith(f".{ext}"):
-                return content_type
+        # Check file extension: one dict lookup on the text after the last dot
+        # of the path, ignoring any query string or fragment
+        path = url_lower.partition("?")[0].partition("#")[0]
+        _, dot, ext = path.rpartition(".")
+        if dot and ext in self.file_extensions:
+            return self.file_extensions[ext]
 
         # Check URL patterns
-        if any(x in url_lower for x in ["youtube.com", "vimeo.com", "video"]):
+        if _contains_any(url_lower, _VIDEO_MARKERS):
             return "video"
 
-        if any(x in url_lower for x in ["image", ".jpg", ".png", ".gif"]):
+        if _contains_any(url_lower, _IMAGE_MARKERS):
             return "image"
 
         return "webpage"
@@ -283,19 +326,27 @@ class ResultParser:
         """
         score = 0.0
 
-        # Normalize query
-        query_terms = query.lower().split()
+        # Normalize query (split once per distinct query)
+        query_terms = _query_terms(query)
+        term_count = max(len(query_terms), 1)
         title_lower = title.lower()
         snippet_lower = snippet.lower()
 
+        # Count title and snippet matches in one pass over the query terms
+        title_matches = 0
+        snippet_matches = 0
+        for term in query_terms:
+            if term in title_lower:
+                title_matches += 1
+            if term in snippet_lower:
+                snippet_matches += 1
+
         # Title matches (40% weight)
-        title_matches = sum(1 for term in query_terms if term in title_lower)
-        title_score = title_matches / max(len(query_terms), 1)
+        title_score = title_matches / term_count
         score += title_score * 0.4
 
         # Snippet matches (30% weight)
-        snippet_matches = sum(1 for term in query_terms if term in snippet_lower)
-        snippet_score = snippet_matches / max(len(query_terms), 1)
+        snippet_score = snippet_matches / term_count
         score += snippet_score * 0.3
 
         # Position score (30% weight) - higher positions = better
@@ -326,13 +377,8 @@ class ResultParser:
                 metadata[key] = kwargs[key]
 
         # Extract dates from snippet
-        date_patterns = [
-            r"\b(\d{1,2}[\s/-]\w+[\s/-]\d{2,4})\b",  # 15 Jan 2024
-            r"\b(\d{4}-\d{2}-\d{2})\b",  # 2024-01-15
-        ]
-
-        for pattern in date_patterns:
-            match = re.search(pattern, snippet)
+        for pattern in _DATE_RES:
+            match = pattern.search(snippet)
             if match:
                 metadata["extracted_date"] = match.group(1)
                 break
@@ -372,6 +418,11 @@ class ResultParser:
             domains = domain_whitelist
         if domain_blacklist:
             exclude_domains = domain_blacklist
+
+        # Sets for O(1) membership in the loop below
+        allowed_types = frozenset(content_types) if content_types else None
+        allowed_domains = frozenset(domains) if domains else None
+        blocked_domains = frozenset(exclude_domains) if exclude_domains else None
         filtered = []
 
         for result in results:
@@ -380,15 +431,15 @@ class ResultParser:
                 continue
 
             # Check content type
-            if content_types and result.content_type not in content_types:
+            if allowed_types and result.content_type not in allowed_types:
                 continue
 
             # Check domain whitelist
-            if domains and result.domain not in domains:
+            if allowed_domains and result.domain not in allowed_domains:
                 continue
 
             # Check domain blacklist
-            if exclude_domains and result.domain in exclude_domains:
+            if blocked_domains and result.domain in blocked_domains:
                 continue
 
             filtered.append(result)
@@ -411,7 +462,12 @@ class ResultParser:
         Returns:
             Re-ranked list of results
         """
-        scored_results = []
+        # One clock read and two cutoffs for the whole batch; comparing
+        # datetimes avoids a timedelta per result
+        now = datetime.utcnow()
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+        scores = []
 
         for result in results:
             score = result.relevance_score
@@ -421,16 +477,16 @@ class ResultParser:
                 score *= boost_domains[result.domain]
 
             # Boost recent content
-            if boost_recent and result.published_date:
-                days_old = (datetime.utcnow() - result.published_date).days
-                if days_old < 7:
+            published = result.published_date
+            if boost_recent and published:
+                if published > week_ago:
                     score *= 1.2
-                elif days_old < 30:
+                elif published > month_ago:
                     score *= 1.1
 
-            scored_results.append((score, result))
+            scores.append(score)
 
-        # Sort by score descending
-        scored_results.sort(key=lambda x: x[0], reverse=True)
+        # Sort by score descending (stable, like the previous tuple sort)
+        order = sorted(range(len(results)), key=scores.__getitem__, reverse=True)
 
-        return [result for _, result in scored_results]
+        return [results[index] for index in order]
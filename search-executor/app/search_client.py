@@ -4,14 +4,44 @@ This module provides a wrapper around SerpAPI for performing web searches
 with rate limiting, error handling, and result parsing.
 """
 
+import logging
 import os
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
 import httpx
 import asyncio
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; httpx's stdlib json decoding is used instead
+    orjson = None
+
+if TYPE_CHECKING:
+    from .cache import SearchCache
+
+logger = logging.getLogger(__name__)
+
+# Event loop that search_sync dispatches to, run forever in a daemon thread
+_bg_loop: Optional[asyncio.AbstractEventLoop] = None
+_bg_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop used by search_sync."""
+    global _bg_loop
+    with _bg_loop_lock:
+        if _bg_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="search-client-loop", daemon=True
+            ).start()
+            _bg_loop = loop
+    return _bg_loop
+
 
 class SearchError(Exception):
     """Raised when search operation fails."""
@@ -19,7 +49,7 @@ class SearchError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """A single search result."""
 
@@ -44,6 +74,14 @@ class SearchResult:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
+        if orjson is not None:
+            # orjson serializes the dataclass and its datetime in C, with the
+            # same ISO 8601 output as isoformat()
+            try:
+                return orjson.loads(orjson.dumps(self))
+            except TypeError:
+                pass
+
         return {
             "title": self.title,
             "url": self.url,
@@ -66,6 +104,8 @@ class SearchClient:
         cache_ttl: int = 86400,  # 24 hours
         timeout: int = 30,
         max_retries: int = 3,
+        soft_ttl: int = 3600,  # 1 hour
+        cache: Optional["SearchCache"] = None,
     ):
         """Initialize search client.
 
@@ -75,27 +115,42 @@ class SearchClient:
             cache_ttl: Cache TTL in seconds
             timeout: Request timeout in seconds
             max_retries: Max retry attempts
+            soft_ttl: Age in seconds after which a cache hit is still served
+                but revalidated against the API in the background
+            cache: Optional result cache consulted before calling the API
         """
         self.api_key = api_key or os.getenv("SERPAPI_KEY")
         self.engine = engine
         self.cache_ttl = cache_ttl
+        self.soft_ttl = soft_ttl
+        self.cache = cache
         self.timeout = timeout
         self.max_retries = max_retries
 
         # Rate limiting
         self.requests_per_second = 5
-        self.last_request_time = 0
-        self._rate_limit_lock = asyncio.Lock()
+        self._next_request_time = 0.0
 
         # API endpoints
         self.base_url = "https://serpapi.com/search"
 
+        # HTTP clients (lazy initialization), reused so keep-alive connections
+        # and TLS sessions carry over between searches; one per event loop,
+        # since pooled connections cannot outlive the loop that opened them
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+        # Background revalidation: in-flight tasks, and the monotonic time
+        # before which each stale query is not revalidated again
+        self._revalidations: set = set()
+        self._revalidate_after: Dict[str, float] = {}
+
         # Statistics
         self.stats = {
             "total_searches": 0,
             "cache_hits": 0,
             "api_calls": 0,
             "errors": 0,
+            "parse_errors": 0,
         }
 
     async def search(
@@ -146,6 +201,15 @@ class SearchClient:
         # Add custom parameters
         params.update(kwargs)
 
+        # Serve from cache, revalidating stale entries in the background
+        filters = {k: v for k, v in params.items() if k not in ("q", "api_key")}
+        if self.cache is not None:
+            entry = await self.cache.get_entry(params["q"], **filters)
+            if entry is not None:
+                self.stats["cache_hits"] += 1
+                self._schedule_revalidation(params, filters, entry)
+                return [SearchResult(**result) for result in entry["results"]]
+
         # Apply rate limiting
         await self._apply_rate_limit()
 
@@ -153,12 +217,112 @@ class SearchClient:
         try:
             results = await self._make_request(params)
             self.stats["api_calls"] += 1
-            return results
 
         except Exception as e:
             self.stats["errors"] += 1
             raise SearchError(f"Search failed: {e}")
 
+        # A caching failure must not discard good API results
+        if self.cache is not None:
+            try:
+                await self.cache.set(params["q"], results, **filters)
+            except Exception as e:
+                logger.warning("Failed to cache search results: %s", e)
+
+        return results
+
+    def _schedule_revalidation(
+        self, params: Dict[str, Any], filters: Dict[str, Any], entry: Dict[str, Any]
+    ):
+        """Start a background refresh of a cache entry older than soft_ttl.
+
+        Args:
+            params: Request parameters of the search
+            filters: Cache filters of the search
+            entry: Cache entry that was served
+        """
+        age = datetime.utcnow() - datetime.fromisoformat(entry["cached_at"])
+        if age.total_seconds() <= self.soft_ttl:
+            return
+
+        # At most one revalidation per query per soft_ttl, even when the
+        # results turn out unchanged and the entry keeps its old cached_at
+        key = f"{params['q']}|{sorted(filters.items())}"
+        now = time.monotonic()
+        if now < self._revalidate_after.get(key, 0.0):
+            return
+        if len(self._revalidate_after) >= 1024:
+            self._revalidate_after = {
+                k: t for k, t in self._revalidate_after.items() if t > now
+            }
+        self._revalidate_after[key] = now + self.soft_ttl
+
+        task = asyncio.create_task(self._revalidate(params, filters, entry.get("hash")))
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+    async def _revalidate(
+        self,
+        params: Dict[str, Any],
+        filters: Dict[str, Any],
+        previous_hash: Optional[str],
+    ):
+        """Refetch results and recache them only if their content changed.
+
+        Args:
+            params: Request parameters of the search
+            filters: Cache filters of the search
+            previous_hash: Results hash of the cache entry being revalidated
+        """
+        try:
+            await self._apply_rate_limit()
+            results = await self._make_request(params)
+            self.stats["api_calls"] += 1
+            await self.cache.set_if_changed(
+                params["q"], results, previous_hash, **filters
+            )
+        except Exception as e:
+            logger.warning("Failed to revalidate cached search: %s", e)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get or initialize the HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            await self._drop_stale_clients()
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def _drop_stale_clients(self):
+        """Release clients whose event loop has been closed."""
+        for loop in [loop for loop in self._clients if loop.is_closed()]:
+            client = self._clients.pop(loop)
+            try:
+                await client.aclose()
+            except Exception:
+                # Its transports went with the closed loop; dropping the
+                # client lets the sockets be collected
+                pass
+
+    async def close(self):
+        """Close the HTTP client used on the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        await self._drop_stale_clients()
+
+    async def __aenter__(self) -> "SearchClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
     async def _make_request(self, params: Dict[str, Any]) -> List[SearchResult]:
         """Make HTTP request to SerpAPI.
 
@@ -168,37 +332,42 @@ class SearchClient:
         Returns:
             List of SearchResult objects
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            for attempt in range(self.max_retries):
-                try:
-                    response = await client.get(self.base_url, params=params)
-                    response.raise_for_status()
-
-                    data = response.json()
-                    return self._parse_results(data)
-
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 429:
-                        # Rate limited, wait and retry
-                        wait_time = 2**attempt  # Exponential backoff
-                        await asyncio.sleep(wait_time)
-                        continue
-                    elif e.response.status_code == 401:
-                        raise SearchError("Invalid API key")
-                    else:
-                        raise SearchError(f"HTTP error: {e.response.status_code}")
-
-                except httpx.TimeoutException:
-                    if attempt < self.max_retries - 1:
-                        await asyncio.sleep(1)
-                        continue
-                    raise SearchError("Request timeout")
-
-                except Exception as e:
-                    if attempt < self.max_retries - 1:
-                        await asyncio.sleep(1)
-                        continue
-                    raise SearchError(f"Request failed: {e}")
+        client = await self._get_client()
+        for attempt in range(self.max_retries):
+            try:
+                response = await client.get(self.base_url, params=params)
+                response.raise_for_status()
+
+                # orjson parses the raw bytes without decoding them to str first
+                data = (
+                    orjson.loads(response.content)
+                    if orjson is not None
+                    else response.json()
+                )
+                return self._parse_results(data)
+
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429:
+                    # Rate limited, wait and retry
+                    wait_time = 2**attempt  # Exponential backoff
+                    await asyncio.sleep(wait_time)
+                    continue
+                elif e.response.status_code == 401:
+                    raise SearchError("Invalid API key")
+                else:
+                    raise SearchError(f"HTTP error: {e.response.status_code}")
+
+            except httpx.TimeoutException:
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(1)
+                    continue
+                raise SearchError("Request timeout")
+
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(1)
+                    continue
+                raise SearchError(f"Request failed: {e}")
 
         raise SearchError("Max retries exceeded")
 
@@ -213,6 +382,9 @@ class SearchClient:
         """
         results = []
 
+        # One timestamp for the whole response
+        timestamp = datetime.utcnow()
+
         # Parse organic results
         organic_results = data.get("organic_results", [])
 
@@ -224,11 +396,13 @@ class SearchClient:
                     snippet=result.get("snippet", ""),
                     position=result.get("position", idx + 1),
                     source="organic",
+                    timestamp=timestamp,
                 )
                 results.append(search_result)
 
             except Exception as e:
-                print(f"Warning: Failed to parse result {idx}: {e}")
+                self.stats["parse_errors"] += 1
+                logger.warning("Failed to parse result %d: %s", idx, e)
                 continue
 
         # Parse featured snippet if present
@@ -241,6 +415,7 @@ class SearchClient:
                     snippet=featured_snippet.get("snippet", ""),
                     position=0,
                     source="featured",
+                    timestamp=timestamp,
                 )
                 results.insert(0, snippet_result)
             except Exception:
@@ -249,16 +424,18 @@ class SearchClient:
         return results
 
     async def _apply_rate_limit(self):
-        """Apply rate limiting to prevent API abuse."""
-        async with self._rate_limit_lock:
-            current_time = asyncio.get_event_loop().time()
-            time_since_last = current_time - self.last_request_time
-            min_interval = 1.0 / self.requests_per_second
+        """Apply rate limiting to prevent API abuse.
 
-            if time_since_last < min_interval:
-                await asyncio.sleep(min_interval - time_since_last)
+        Each call reserves the next free request slot before awaiting, so
+        concurrent searches sleep in parallel until their own slot instead of
+        queueing on a lock. Nothing is bound to an event loop.
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_request_time)
+        self._next_request_time = slot + 1.0 / self.requests_per_second
 
-            self.last_request_time = asyncio.get_event_loop().time()
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
     def get_stats(self) -> Dict[str, int]:
         """Get client statistics.
@@ -279,21 +456,12 @@ class SearchClient:
         Returns:
             List of SearchResult objects
         """
-        try:
-            # Try to get existing event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # Create a new event loop in a thread
-                import concurrent.futures
-
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self.search(query, **kwargs))
-                    return future.result()
-            else:
-                return loop.run_until_complete(self.search(query, **kwargs))
-        except RuntimeError:
-            # No event loop exists, create one
-            return asyncio.run(self.search(query, **kwargs))
+        # Dispatch onto the shared background loop: no event loop is created
+        # per call, and the loop's HTTP client stays open between calls
+        future = asyncio.run_coroutine_threadsafe(
+            self.search(query, **kwargs), _background_loop()
+        )
+        return future.result()
 
 
 class MockSearchClient(SearchClient):
@@ -308,18 +476,17 @@ class MockSearchClient(SearchClient):
         query = params.get("q", "")
         num_results = params.get("num", 10)
 
-        # Generate mock results
-        results = []
-        for i in range(min(num_results, 5)):
-            results.append(
-                SearchResult(
-                    title=f"Mock Result {i + 1} for: {query}",
-                    url=f"https://example.com/result{i + 1}",
-                    snippet=f"This is a mock snippet for result {i + 1} about {query}. "
-                    f"It contains relevant information and appears in position {i + 1}.",
-                    position=i + 1,
-                    source="organic",
-                )
+        # Generate mock results, sharing one timestamp
+        timestamp = datetime.utcnow()
+        return [
+            SearchResult(
+                title=f"Mock Result {i} for: {query}",
+                url=f"https://example.com/result{i}",
+                snippet=f"This is a mock snippet for result {i} about {query}. "
+                f"It contains relevant information and appears in position {i}.",
+                position=i,
+                source="organic",
+                timestamp=timestamp,
             )
-
-        return results
+            for i in range(1, min(num_results, 5) + 1)
+        ]
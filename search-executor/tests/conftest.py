@@ -0,0 +1,27 @@
+"""Shared fixtures for search-executor tests."""
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def mock_httpx(request, monkeypatch):
+    """Route every new httpx.AsyncClient through a MockTransport.
+
+    Parametrize indirectly with the transport handler, e.g.
+    ``@pytest.mark.parametrize("mock_httpx", [handler], indirect=True)``.
+
+    Returns:
+        List of the clients created while the test runs
+    """
+    handler = request.param
+    created = []
+    real_client = httpx.AsyncClient
+
+    def make_client(**kwargs):
+        client = real_client(transport=httpx.MockTransport(handler), **kwargs)
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(httpx, "AsyncClient", make_client)
+    return created
@@ -2,7 +2,7 @@
 
 import pytest
 import asyncio
-from app.cache import MockSearchCache
+from app.cache import MockSearchCache, SearchCache
 from app.search_client import SearchResult
 
 
@@ -202,6 +202,7 @@ async def test_cache_key_generation():
     key2 = cache._generate_key("test query", {"location": "US", "lang": "en"})
 
     assert key1 == key2
+    assert key1.startswith(b"search:")
 
     # Different query should generate different key
     key3 = cache._generate_key("other query", {"location": "US", "lang": "en"})
@@ -211,6 +212,17 @@ async def test_cache_key_generation():
     key4 = cache._generate_key("test query", {"location": "UK", "lang": "en"})
     assert key1 != key4
 
+    # Filter order does not matter, and unhashable filter values still work
+    assert key1 == cache._generate_key("test query", {"lang": "en", "location": "US"})
+    key5 = cache._generate_key("test query", {"domains": ["a.com", "b.com"]})
+    assert key5 == cache._generate_key("test query", {"domains": ["a.com", "b.com"]})
+
+    # Equal but differently formatted values keep distinct, order-independent keys
+    key_true = cache._generate_key("flag query", {"safe": True})
+    key_one = cache._generate_key("flag query", {"safe": 1})
+    assert key_true != key_one
+    assert key_true == MockSearchCache()._generate_key("flag query", {"safe": True})
+
 
 @pytest.mark.asyncio
 async def test_cache_multiple_queries():
@@ -236,3 +248,72 @@ async def test_cache_multiple_queries():
         cached = await cache.get(f"query {i}")
         assert cached is not None
         assert len(cached) == 1
+
+
+class _FakeRedis:
+    """Minimal async Redis stand-in counting round trips."""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    async def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+
+@pytest.mark.asyncio
+async def test_cache_l1_skips_redis_round_trip():
+    """Test hot keys are served from the in-process cache."""
+    cache = SearchCache()
+    redis = _FakeRedis()
+    cache._redis = redis
+
+    await cache.set("hot query", [{"title": "Result"}])
+    assert await cache.get("hot query") == [{"title": "Result"}]
+    assert await cache.get("hot query") == [{"title": "Result"}]
+    assert redis.gets == 0
+
+    # Deleting invalidates the in-process copy too
+    await cache.delete("hot query")
+    assert await cache.get("hot query") is None
+    assert redis.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_serializes_plain_dataclasses():
+    """Test dataclasses without to_dict() are stored like asdict() would."""
+    from dataclasses import asdict, dataclass
+
+    @dataclass
+    class Source:
+        name: str
+
+    @dataclass
+    class Item:
+        title: str
+        source: Source
+
+    cache = MockSearchCache()
+    item = Item(title="Result", source=Source(name="web"))
+
+    await cache.set("plain query", [item])
+    assert await cache.get("plain query") == [asdict(item)]
+
+
+@pytest.mark.asyncio
+async def test_cache_set_rejects_unserializable_results():
+    """Test unserializable results are reported as a failed write, not raised."""
+    cache = MockSearchCache()
+
+    assert await cache.set("bad query", [{"a": {1, 2}}]) is False
+    assert await cache.set("bad query", [object()]) is False
+    assert await cache.set_if_changed("bad query", [object()], None) is False
+    assert cache.stats["errors"] == 3
+    assert await cache.get("bad query") is None
@@ -0,0 +1,201 @@
+"""Test suite for ContentFetcher."""
+
+import httpx
+import pytest
+import app.content_fetcher as content_fetcher
+from app.content_fetcher import ContentFetcher
+
+SAMPLE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <title> Sample Page </title>
+    <meta name="description" content="A sample page">
+    <meta name="keywords" content="alpha, beta,, gamma">
+    <meta name="author" content="Jane Doe">
+    <meta property="article:published_time" content="2024-01-01T00:00:00Z">
+</head>
+<body>
+    <header>Site header</header>
+    <nav>Menu</nav>
+    <article>
+        <h1>Main Heading</h1>
+        <p>Some   text here.</p>
+        <p>More <b>bold</b> text</p>
+        <script>var ignored = 1;</script>
+        <aside>Related stories</aside>
+        <noscript>Enable JavaScript</noscript>
+        <h2>Sub Heading</h2>
+    </article>
+    <footer>Footer</footer>
+    <img src="/logo.png">
+    <a href="/about">About</a>
+    <a href="mailto:someone@example.com">Mail</a>
+</body>
+</html>"""
+
+
+def sample_page(request):
+    """Answer every request with SAMPLE_HTML."""
+    return httpx.Response(200, text=SAMPLE_HTML)
+
+
+def sample_page_or_missing(request):
+    """Answer /missing with a 404 and anything else with SAMPLE_HTML."""
+    if request.url.path == "/missing":
+        return httpx.Response(404)
+    return httpx.Response(200, text=SAMPLE_HTML)
+
+
+async def _stream_body():
+    for _ in range(10):
+        yield b"x" * 1000
+
+
+def oversized_body(request):
+    """Answer /declared with a 5000-byte body; stream 10000 bytes otherwise."""
+    if request.url.path == "/declared":
+        return httpx.Response(200, content=b"x" * 5000)
+    return httpx.Response(200, content=_stream_body())
+
+
+@pytest.mark.parametrize("parser", ["html.parser", "lxml"])
+def test_parse_content(monkeypatch, parser):
+    """Test extraction gives the same content with either tree builder."""
+    if parser == "lxml":
+        pytest.importorskip("lxml")
+    monkeypatch.setattr(content_fetcher, "_HTML_PARSER", parser)
+    fetcher = ContentFetcher(extract_images=True, extract_links=True)
+
+    content = fetcher._parse_content(
+        url="https://example.com",
+        final_url="https://example.com/",
+        status_code=200,
+        html=SAMPLE_HTML,
+    )
+
+    assert content.title == "Sample Page"
+    assert content.meta_description == "A sample page"
+    assert content.meta_keywords == ["alpha", "beta", "gamma"]
+    assert content.author == "Jane Doe"
+    assert content.publish_date == "2024-01-01T00:00:00Z"
+    assert content.headings == ["Main Heading", "Sub Heading"]
+    assert content.text_content == (
+        "Main Heading\nSome text here.\nMore\nbold\ntext\nSub Heading"
+    )
+    assert content.images == ["https://example.com/logo.png"]
+    assert content.links == ["https://example.com/about"]
+    assert content.html_content is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mock_httpx", [sample_page], indirect=True)
+async def test_fetch_reuses_client(mock_httpx):
+    """Test fetches share one HTTP client until the fetcher is closed."""
+    async with ContentFetcher() as fetcher:
+        first = await fetcher.fetch("https://example.com/a")
+        second = await fetcher.fetch("https://example.com/b")
+
+    assert first.title == second.title == "Sample Page"
+    assert len(mock_httpx) == 1
+    assert mock_httpx[0].is_closed
+    assert fetcher._parse_pool is None
+    assert fetcher.get_stats()["successful_fetches"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mock_httpx", [sample_page_or_missing], indirect=True)
+async def test_fetch_many(mock_httpx):
+    """Test batch fetching returns content or the raised error per URL."""
+
+    urls = ["https://example.com/a", "https://example.com/missing", "not a url"]
+    async with ContentFetcher() as fetcher:
+        results = await fetcher.fetch_many(urls + urls[:1], concurrency=2)
+
+    assert list(results) == urls
+    assert results[urls[0]].title == "Sample Page"
+    assert isinstance(results[urls[1]], httpx.HTTPStatusError)
+    assert isinstance(results[urls[2]], ValueError)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mock_httpx", [oversized_body], indirect=True)
+async def test_fetch_rejects_oversized_content(mock_httpx):
+    """Test oversized bodies fail whether or not their length is declared."""
+
+    async with ContentFetcher(max_content_length=2000) as fetcher:
+        for path in ("/declared", "/streamed"):
+            with pytest.raises(ValueError, match="Content too large"):
+                await fetcher.fetch(f"https://example.com{path}")
+
+    assert fetcher.get_stats()["failed_fetches"] == 2
+    assert fetcher.get_stats()["bytes_downloaded"] == 0
+
+
+def test_extract_links_and_images_are_capped():
+    """Test link and image extraction dedupes, keeps order and stops at the limit."""
+    from bs4 import BeautifulSoup
+
+    anchors = "".join(f'<a href="/page/{i % 150}">x</a>' for i in range(300))
+    images = "".join(f'<img src="/img/{i}.png">' for i in range(80))
+    soup = BeautifulSoup(f"<body>{anchors}{images}</body>", "html.parser")
+    fetcher = ContentFetcher()
+
+    links = fetcher._extract_links(soup, "https://example.com/")
+    assert links == [f"https://example.com/page/{i}" for i in range(100)]
+
+    images = fetcher._extract_images(soup, "https://example.com/")
+    assert images == [f"https://example.com/img/{i}.png" for i in range(50)]
+
+
+def test_keep_html():
+    """Test raw HTML is only retained when requested."""
+    fetcher = ContentFetcher(keep_html=True)
+
+    content = fetcher._parse_content(
+        url="https://example.com",
+        final_url="https://example.com/",
+        status_code=200,
+        html=SAMPLE_HTML,
+    )
+
+    assert content.html_content == SAMPLE_HTML
+
+
+@pytest.fixture
+def keep_alive_server():
+    """Serve SAMPLE_HTML over HTTP/1.1 keep-alive on a local port."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = SAMPLE_HTML.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_across_event_loops(keep_alive_server):
+    """Test a fetcher keeps working when each fetch runs on a new event loop."""
+    import asyncio
+
+    fetcher = ContentFetcher()
+    for _ in range(3):
+        content = asyncio.run(fetcher.fetch(keep_alive_server))
+        assert content.title == "Sample Page"
+
+    # Clients of the closed loops are dropped when the next one is created
+    assert len(fetcher._clients) == 1
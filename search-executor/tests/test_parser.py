@@ -94,6 +94,10 @@ def test_content_type_detection():
     )
     assert video.content_type == "video"
 
+    # Query strings and fragments do not hide the extension
+    assert parser._detect_content_type("https://example.com/doc.pdf?dl=1") == "pdf"
+    assert parser._detect_content_type("https://example.com/a.png#top") == "image"
+
 
 def test_parse_results_batch():
     """Test batch parsing of multiple results."""
@@ -126,6 +130,7 @@ def test_parse_results_batch():
     assert all(isinstance(r, ParsedContent) for r in parsed)
     assert parsed[0].position == 1
     assert parsed[2].position == 3
+    assert len({r.parsed_at for r in parsed}) == 1
 
 
 def test_filter_by_relevance():
@@ -240,9 +245,9 @@ def test_snippet_truncation():
     """Test snippet length constraints."""
     parser = ResultParser(min_snippet_length=50, max_snippet_length=100)
 
-    # Too short (padded)
+    # Too short (kept as-is, not padded)
     short = parser.parse_result("Title", "https://example.com", "Short", "test", 1)
-    assert len(short.snippet) >= 50
+    assert short.snippet == "Short"
 
     # Too long (truncated)
     long_snippet = "x" * 200
@@ -265,3 +270,64 @@ def test_metadata_extraction():
     # Should have metadata
     assert parsed.metadata is not None
     assert isinstance(parsed.metadata, dict)
+
+
+def test_parsed_content_has_no_instance_dict():
+    """Test parsed results use slots rather than a per-instance dict."""
+    parser = ResultParser()
+    parsed = parser.parse_result(
+        title="Python", url="https://python.org", snippet="Python docs"
+    )
+
+    assert not hasattr(parsed, "__dict__")
+    assert parsed.domain == "python.org"
+
+
+def test_clean_text_decodes_entities():
+    """Test HTML entities are decoded instead of dropped."""
+    parser = ResultParser()
+
+    assert parser._clean_text("Fish &amp; Chips&nbsp; &#8212; &quot;fresh&quot;") == (
+        'Fish & Chips — "fresh"'
+    )
+
+
+def test_parse_results_batch_logs_bad_results(caplog):
+    """Test malformed results are skipped and reported through logging."""
+    parser = ResultParser()
+
+    with caplog.at_level("WARNING", logger="app.parser"):
+        parsed = parser.parse_results_batch(
+            [{"title": "Good", "url": "https://example.com", "snippet": "ok"}, None]
+        )
+
+    assert len(parsed) == 1
+    assert "Failed to parse result 1" in caplog.text
+
+
+def test_rank_boosts_recent_results():
+    """Test recency boosts and stable ordering of equal scores."""
+    from datetime import datetime, timedelta
+
+    parser = ResultParser()
+    now = datetime.utcnow()
+    results = [
+        ParsedContent(
+            title=f"Result {age}",
+            url=f"https://example.com/{age}",
+            domain="",
+            snippet="",
+            relevance_score=0.5,
+            published_date=now - timedelta(days=age) if age is not None else None,
+        )
+        for age in (60, None, 20, 3)
+    ]
+
+    ranked = parser.rank_results(results)
+
+    assert [r.title for r in ranked] == [
+        "Result 3",
+        "Result 20",
+        "Result 60",
+        "Result None",
+    ]
@@ -2,8 +2,27 @@
 
 import pytest
 import asyncio
+import httpx
+from datetime import datetime
 from app.search_client import SearchClient, MockSearchClient, SearchResult, SearchError
 
+API_PAYLOAD = {
+    "organic_results": [
+        {"title": "Python", "link": "https://python.org", "snippet": "Docs"},
+    ],
+    "answer_box": {"title": "Answer", "snippet": "42"},
+}
+
+
+def empty_results(request):
+    """Answer every SerpAPI request with no results."""
+    return httpx.Response(200, json={"organic_results": []})
+
+
+def api_payload(request):
+    """Answer every SerpAPI request with API_PAYLOAD."""
+    return httpx.Response(200, json=API_PAYLOAD)
+
 
 @pytest.mark.asyncio
 async def test_mock_client_search():
@@ -59,6 +78,33 @@ async def test_search_result_to_dict():
     assert data["title"] == "Test Title"
     assert data["url"] == "https://example.com"
     assert data["position"] == 1
+    assert not hasattr(result, "__dict__")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_search_result_to_dict_matches_fallback(monkeypatch, use_orjson):
+    """Test orjson and the plain dict path serialize results identically."""
+    import app.search_client as search_client
+
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(search_client, "orjson", None)
+
+    aware = SearchResult("T", "https://a.com", "S", 1, timestamp="2024-01-01T00:00:00Z")
+    naive = SearchResult(
+        "T", "https://a.com", "S", 2, timestamp=datetime(2024, 1, 1, 12, 0, 0, 5)
+    )
+
+    assert aware.to_dict()["timestamp"] == "2024-01-01T00:00:00+00:00"
+    assert naive.to_dict() == {
+        "title": "T",
+        "url": "https://a.com",
+        "snippet": "S",
+        "position": 2,
+        "source": "organic",
+        "timestamp": "2024-01-01T12:00:00.000005",
+    }
 
 
 @pytest.mark.asyncio
@@ -89,6 +135,20 @@ async def test_search_sync_wrapper():
     assert all(isinstance(r, SearchResult) for r in results)
 
 
+@pytest.mark.parametrize("mock_httpx", [empty_results], indirect=True)
+def test_search_sync_reuses_loop_and_client(mock_httpx):
+    """Test sync searches share one background loop and HTTP client."""
+    import app.search_client as search_client
+
+    client = SearchClient(api_key="test")
+    client.requests_per_second = 1000
+    client.search_sync("first")
+    client.search_sync("second")
+
+    assert len(mock_httpx) == 1
+    assert list(client._clients) == [search_client._background_loop()]
+
+
 def test_search_result_dataclass():
     """Test SearchResult dataclass properties."""
     result = SearchResult(
@@ -134,3 +194,112 @@ async def test_mock_client_language_filter():
     results = await client.search("test", language="en")
 
     assert len(results) == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mock_httpx", [api_payload], indirect=True)
+async def test_make_request_parses_api_response(mock_httpx):
+    """Test SerpAPI responses are decoded into results."""
+    results = await SearchClient(api_key="test").search("python")
+
+    assert [(r.source, r.title) for r in results] == [
+        ("featured", "Answer"),
+        ("organic", "Python"),
+    ]
+    assert results[0].timestamp is results[1].timestamp
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mock_httpx", [empty_results], indirect=True)
+async def test_searches_reuse_client(mock_httpx):
+    """Test searches share one HTTP client until the client is closed."""
+    async with SearchClient(api_key="test") as client:
+        await client.search("first")
+        await client.search("second")
+
+    assert len(mock_httpx) == 1
+    assert mock_httpx[0].is_closed
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_spaces_concurrent_requests():
+    """Test concurrent requests are spaced by the rate limit, not serialized."""
+    import time
+
+    client = MockSearchClient()
+    client.requests_per_second = 20
+
+    start = time.monotonic()
+    await asyncio.gather(*(client._apply_rate_limit() for _ in range(4)))
+    elapsed = time.monotonic() - start
+
+    # Four slots 50ms apart: the last one starts 150ms after the first
+    assert 0.14 <= elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_stale_cache_hits_are_revalidated():
+    """Test stale hits are served from cache and rewritten only if changed."""
+    from app.cache import MockSearchCache
+
+    cache = MockSearchCache()
+    client = MockSearchClient(cache=cache, soft_ttl=0)
+
+    fresh = await client.search("python")
+    cached = await client.search("python")
+    await asyncio.gather(*client._revalidations)
+
+    # Served from cache; the revalidation fetched identical results
+    assert [r.title for r in cached] == [r.title for r in fresh]
+    assert client.get_stats()["cache_hits"] == 1
+    assert client.get_stats()["api_calls"] == 2
+    assert cache.stats["writes"] == 1
+
+    # Once the content differs from the cached hash, the entry is rewritten
+    next(iter(cache._cache.values()))["hash"] = "outdated"
+    client._revalidate_after.clear()
+    await client.search("python")
+    await asyncio.gather(*client._revalidations)
+    assert cache.stats["writes"] == 2
+
+
+def test_parse_results_logs_bad_results(caplog):
+    """Test malformed API results are skipped, counted and logged."""
+    client = SearchClient(api_key="test")
+    data = {"organic_results": [{"title": "Good", "link": "https://a.com"}, None]}
+
+    with caplog.at_level("WARNING", logger="app.search_client"):
+        results = client._parse_results(data)
+
+    assert [r.title for r in results] == ["Good"]
+    assert client.get_stats()["parse_errors"] == 1
+    assert "Failed to parse result 1" in caplog.text
+
+
+@pytest.mark.parametrize("mock_httpx", [empty_results], indirect=True)
+def test_clients_of_closed_loops_are_released(mock_httpx):
+    """Test searches on successive event loops do not accumulate clients."""
+    client = SearchClient(api_key="test")
+    client.requests_per_second = 1000
+    for _ in range(5):
+        asyncio.run(client.search("python"))
+
+    assert len(client._clients) == 1
+    assert all(c.is_closed for c in mock_httpx[:-1])
+
+
+@pytest.mark.asyncio
+async def test_cache_failure_does_not_fail_search():
+    """Test results are still returned when caching them fails."""
+    from app.cache import MockSearchCache
+
+    class BrokenCache(MockSearchCache):
+        async def set(self, query, results, **filters):
+            raise RuntimeError("cache down")
+
+    client = MockSearchClient(cache=BrokenCache())
+
+    results = await client.search("python")
+
+    assert len(results) == 5
+    assert client.get_stats()["errors"] == 0
@@ -1,10 +1,9 @@
 """FastAPI main application for TTS service."""
 
-import io
 import logging
 import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Dict, Tuple
 
 from fastapi import FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -32,6 +31,35 @@ logger = logging.getLogger(__name__)
 # Track service start time
 SERVICE_START_TIME = time.time()
 
+# Response media type per audio format
+MEDIA_TYPES = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "ogg": "audio/ogg",
+    "flac": "audio/flac",
+}
+
+# Cache stats snapshot served by /health; probes arrive every few seconds and
+# get_stats() queries the on-disk cache
+_stats_cache: Dict[str, Any] = {"ts": 0.0, "val": None}
+
+
+def _get_cached_stats(max_age: float = 1.0) -> Dict[str, Any]:
+    """
+    Get cache statistics, refreshed at most once per max_age seconds.
+
+    Args:
+        max_age: Maximum snapshot age in seconds
+
+    Returns:
+        Dictionary with cache statistics
+    """
+    now = time.monotonic()
+    if _stats_cache["val"] is None or now - _stats_cache["ts"] >= max_age:
+        _stats_cache["val"] = voice_cache.get_stats()
+        _stats_cache["ts"] = now
+    return _stats_cache["val"]
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
@@ -102,7 +130,7 @@ async def health_check() -> HealthResponse:
     Returns service health status and statistics.
     """
     uptime = time.time() - SERVICE_START_TIME
-    cache_stats = voice_cache.get_stats()
+    cache_stats = _get_cached_stats()
 
     return HealthResponse(
         status="healthy" if synthesizer.is_loaded() else "unhealthy",
@@ -175,6 +203,54 @@ async def list_voices() -> VoiceListResponse:
     return VoiceListResponse(voices=voices, total_count=len(voices))
 
 
+def _get_audio(request: SynthesisRequest, audio_format: str) -> Tuple[bytes, bool]:
+    """
+    Get audio for a request from the cache, or synthesize and cache it.
+
+    Args:
+        request: Synthesis request with text and parameters
+        audio_format: Requested audio format
+
+    Returns:
+        Tuple of (audio bytes, whether they were served from cache)
+    """
+    use_cache = request.use_cache and voice_cache.enabled
+
+    if use_cache:
+        cached_audio = voice_cache.get(
+            text=request.text,
+            speaker_id=request.speaker_id,
+            language=request.language,
+            speed=request.speed,
+            pitch=request.pitch,
+            audio_format=audio_format,
+        )
+        if cached_audio:
+            return cached_audio, True
+
+    audio_bytes = synthesizer.synthesize_to_bytes(
+        text=request.text,
+        speaker_id=request.speaker_id,
+        language=request.language,
+        speed=request.speed,
+        audio_format=audio_format,
+        use_cache=False,
+    )
+
+    if use_cache:
+        voice_cache.set(
+            audio_bytes=audio_bytes,
+            text=request.text,
+            speaker_id=request.speaker_id,
+            language=request.language,
+            speed=request.speed,
+            pitch=request.pitch,
+            audio_format=audio_format,
+        )
+
+    return audio_bytes, False
+
+
 @app.post(
     "/synthesize",
     response_model=SynthesisResponse,
@@ -201,59 +277,16 @@ async def synthesize_text(request: SynthesisRequest) -> SynthesisResponse:
     """
     try:
         start_time = time.time()
-        cached = False
-
-        # Check cache first if enabled
-        if request.use_cache and voice_cache.enabled:
-            cached_audio = voice_cache.get(
-                text=request.text,
-                speaker_id=request.speaker_id,
-                language=request.language,
-                speed=request.speed,
-                pitch=request.pitch,
-                audio_format=request.format.value,
-            )
-
-            if cached_audio:
-                cached = True
-                audio_bytes = cached_audio
-                logger.info(f"Serving cached audio for: '{request.text[:50]}...'")
-            else:
-                # Generate audio
-                audio_bytes = synthesizer.synthesize_to_bytes(
-                    text=request.text,
-                    speaker_id=request.speaker_id,
-                    language=request.language,
-                    speed=request.speed,
-                    audio_format=request.format.value,
-                    use_cache=False,
-                )
-
-                # Cache the result
-                voice_cache.set(
-                    audio_bytes=audio_bytes,
-                    text=request.text,
-                    speaker_id=request.speaker_id,
-                    language=request.language,
-                    speed=request.speed,
-                    pitch=request.pitch,
-                    audio_format=request.format.value,
-                )
-        else:
-            # Generate audio without cache
-            audio_bytes = synthesizer.synthesize_to_bytes(
-                text=request.text,
-                speaker_id=request.speaker_id,
-                language=request.language,
-                speed=request.speed,
-                audio_format=request.format.value,
-                use_cache=False,
-            )
+        audio_format = request.format.value
+
+        audio_bytes, cached = _get_audio(request, audio_format)
+        if cached:
+            logger.info(f"Serving cached audio for: '{request.text[:50]}...'")
 
         generation_time = time.time() - start_time
 
         # Calculate audio duration (approximate for WAV)
-        if request.format.value == "wav":
+        if audio_format == "wav":
             # WAV: 44 bytes header, then samples
             audio_samples = (len(audio_bytes) - 44) / 2  # 16-bit = 2 bytes per sample
             duration = audio_samples / settings.audio_sample_rate
@@ -265,7 +298,7 @@ async def synthesize_text(request: SynthesisRequest) -> SynthesisResponse:
             audio_url=None,  # Could be set if storing files
             duration_seconds=duration,
             sample_rate=synthesizer.get_model_sample_rate(),
-            format=request.format.value,
+            format=audio_format,
             cached=cached,
             generation_time_ms=generation_time * 1000,
             text_length=len(request.text),
@@ -304,69 +337,25 @@ async def synthesize_stream(request: SynthesisRequest) -> StreamingResponse:
         HTTPException: If synthesis fails
     """
     try:
-        # Check cache first
-        cached_audio = None
-        if request.use_cache and voice_cache.enabled:
-            cached_audio = voice_cache.get(
-                text=request.text,
-                speaker_id=request.speaker_id,
-                language=request.language,
-                speed=request.speed,
-                pitch=request.pitch,
-                audio_format=request.format.value,
-            )
+        audio_format = request.format.value
 
-        if cached_audio:
-            # Stream cached audio
+        audio_bytes, cached = _get_audio(request, audio_format)
+        if cached:
             logger.info(f"Streaming cached audio for: '{request.text[:50]}...'")
-            audio_bytes = cached_audio
-        else:
-            # Generate audio
-            audio_bytes = synthesizer.synthesize_to_bytes(
-                text=request.text,
-                speaker_id=request.speaker_id,
-                language=request.language,
-                speed=request.speed,
-                audio_format=request.format.value,
-                use_cache=False,
-            )
-
-            # Cache the result
-            if request.use_cache:
-                voice_cache.set(
-                    audio_bytes=audio_bytes,
-                    text=request.text,
-                    speaker_id=request.speaker_id,
-                    language=request.language,
-                    speed=request.speed,
-                    pitch=request.pitch,
-                    audio_format=request.format.value,
-                )
 
         # Create streaming response
         def audio_stream():
             """Generator to stream audio in chunks."""
-            buffer = io.BytesIO(audio_bytes)
-            while True:
-                chunk = buffer.read(settings.stream_chunk_size)
-                if not chunk:
-                    break
-                yield chunk
-
-        # Determine media type
-        media_type_map = {
-            "wav": "audio/wav",
-            "mp3": "audio/mpeg",
-            "ogg": "audio/ogg",
-            "flac": "audio/flac",
-        }
-        media_type = media_type_map.get(request.format.value, "audio/wav")
+            # Slicing copies each chunk once, straight out of audio_bytes
+            chunk_size = settings.stream_chunk_size
+            for start in range(0, len(audio_bytes), chunk_size):
+                yield audio_bytes[start : start + chunk_size]
 
         return StreamingResponse(
             audio_stream(),
-            media_type=media_type,
+            media_type=MEDIA_TYPES.get(audio_format, "audio/wav"),
             headers={
-                "Content-Disposition": f'attachment; filename="synthesis.{request.format.value}"',
+                "Content-Disposition": f'attachment; filename="synthesis.{audio_format}"',
                 "X-Audio-Duration": str(len(request.text) * 0.05),
                 "X-Text-Length": str(len(request.text)),
             },
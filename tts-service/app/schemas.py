@@ -75,11 +75,10 @@ class SynthesisRequest(BaseModel):
     @classmethod
     def validate_text(cls, v: str) -> str:
         """Validate and clean text input."""
-        text = v.strip()
+        # Collapse whitespace runs; split() also drops leading/trailing whitespace
+        text = " ".join(v.split())
         if not text:
             raise ValueError("Text cannot be empty")
-        # Remove multiple spaces
-        text = " ".join(text.split())
         return text
 
 
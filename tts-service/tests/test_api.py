@@ -223,3 +223,19 @@ async def test_long_text():
         assert response.status_code == 200
         data = response.json()
         assert data["duration_seconds"] > 0
+
+
+def test_health_stats_snapshot(monkeypatch):
+    """Test health checks reuse a recent cache stats snapshot."""
+    from app import main
+
+    calls = []
+    monkeypatch.setattr(main.voice_cache, "get_stats", lambda: calls.append(1) or {"size": 0})
+    monkeypatch.setattr(main, "_stats_cache", {"ts": 0.0, "val": None})
+
+    main._get_cached_stats()
+    main._get_cached_stats()
+    assert len(calls) == 1
+
+    main._get_cached_stats(max_age=0)
+    assert len(calls) == 2